@@ -0,0 +1,22 @@
+"""add keyset pagination indexes
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_index('ix_news_published_at_id', 'news', ['published_at', 'id'])
+    op.create_index('ix_comments_published_at_id', 'comments', ['published_at', 'id'])
+    op.create_index('ix_users_registered_at_id', 'users', ['registered_at', 'id'])
+
+def downgrade():
+    op.drop_index('ix_users_registered_at_id', table_name='users')
+    op.drop_index('ix_comments_published_at_id', table_name='comments')
+    op.drop_index('ix_news_published_at_id', table_name='news')
@@ -0,0 +1,49 @@
+"""add denormalized comment/news counters
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 10000
+
+BACKFILL = {
+    'news': [
+        "UPDATE news SET comment_count = "
+        "(SELECT count(*) FROM comments WHERE comments.news_id = news.id) "
+        "WHERE id >= :lo AND id < :hi",
+    ],
+    'users': [
+        "UPDATE users SET news_count = "
+        "(SELECT count(*) FROM news WHERE news.author_id = users.id) "
+        "WHERE id >= :lo AND id < :hi",
+        "UPDATE users SET comment_count = "
+        "(SELECT count(*) FROM comments WHERE comments.author_id = users.id) "
+        "WHERE id >= :lo AND id < :hi",
+    ],
+}
+
+def upgrade():
+    op.add_column('news', sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('users', sa.Column('news_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('users', sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill in id ranges to keep each statement small
+    conn = op.get_bind()
+    for table, statements in BACKFILL.items():
+        max_id = conn.execute(sa.text(f"SELECT max(id) FROM {table}")).scalar() or 0
+        for lo in range(0, max_id + 1, BATCH_SIZE):
+            for statement in statements:
+                conn.execute(sa.text(statement), {"lo": lo, "hi": lo + BATCH_SIZE})
+
+def downgrade():
+    op.drop_column('users', 'comment_count')
+    op.drop_column('users', 'news_count')
+    op.drop_column('news', 'comment_count')
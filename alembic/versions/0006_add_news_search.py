@@ -0,0 +1,82 @@
+"""add news full-text search index
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+import json
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+TS_CONFIG = 'simple'
+
+def _extract_text(content):
+    if isinstance(content, str):
+        try:
+            content = json.loads(content)
+        except ValueError:
+            return content
+    parts = []
+    stack = [content]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if isinstance(node.get('text'), str):
+                parts.append(node['text'])
+            stack.extend(value for key, value in node.items() if key != 'text')
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return '\n'.join(parts)
+
+def upgrade():
+    conn = op.get_bind()
+    dialect = conn.dialect.name
+    if dialect == 'postgresql':
+        op.create_table(
+            'news_search',
+            sa.Column('news_id', sa.Integer, sa.ForeignKey('news.id', ondelete='CASCADE'), primary_key=True),
+            sa.Column('document', sa.dialects.postgresql.TSVECTOR, nullable=False),
+        )
+        op.create_index('ix_news_search_document', 'news_search', ['document'], postgresql_using='gin')
+        insert = sa.text(
+            "INSERT INTO news_search (news_id, document) VALUES (:id, "
+            "setweight(to_tsvector(CAST(:config AS regconfig), :title), 'A') || "
+            "setweight(to_tsvector(CAST(:config AS regconfig), :body), 'B'))"
+        )
+    elif dialect == 'sqlite':
+        conn.execute(sa.text(
+            "CREATE VIRTUAL TABLE news_fts USING fts5("
+            "title, body, tokenize = 'unicode61 remove_diacritics 2')"
+        ))
+        insert = sa.text("INSERT INTO news_fts (rowid, title, body) VALUES (:id, :title, :body)")
+    else:
+        return
+
+    # Backfill in id order, one batch at a time
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text("SELECT id, title, content FROM news WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+        conn.execute(insert, [
+            {"id": row.id, "title": row.title, "body": _extract_text(row.content), "config": TS_CONFIG}
+            for row in rows
+        ])
+        last_id = rows[-1].id
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.drop_index('ix_news_search_document', table_name='news_search')
+        op.drop_table('news_search')
+    elif dialect == 'sqlite':
+        op.execute("DROP TABLE news_fts")
@@ -0,0 +1,53 @@
+"""store refresh tokens as sha256 digests
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+"""
+import hashlib
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+def upgrade():
+    op.add_column('refresh_tokens', sa.Column('token_hash', sa.String(64), nullable=True))
+
+    # Digest existing tokens in id order so live sessions survive the upgrade
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text("SELECT id, token FROM refresh_tokens WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+        params = [
+            {"id": row_id, "token_hash": hashlib.sha256(token.encode()).hexdigest()}
+            for row_id, token in rows if token
+        ]
+        if params:
+            conn.execute(sa.text("UPDATE refresh_tokens SET token_hash = :token_hash WHERE id = :id"), params)
+        last_id = rows[-1][0]
+    op.execute("DELETE FROM refresh_tokens WHERE token_hash IS NULL")
+
+    op.drop_index('ix_refresh_tokens_token', table_name='refresh_tokens')
+    with op.batch_alter_table('refresh_tokens') as batch_op:
+        batch_op.drop_column('token')
+        batch_op.alter_column('token_hash', existing_type=sa.String(64), nullable=False)
+    op.create_index('ix_refresh_tokens_token_hash', 'refresh_tokens', ['token_hash'], unique=True)
+
+def downgrade():
+    # Digests cannot be turned back into tokens: every session is dropped
+    op.execute("DELETE FROM refresh_tokens")
+    op.drop_index('ix_refresh_tokens_token_hash', table_name='refresh_tokens')
+    with op.batch_alter_table('refresh_tokens') as batch_op:
+        batch_op.drop_column('token_hash')
+        batch_op.add_column(sa.Column('token', sa.String(512), nullable=True))
+    op.create_index('ix_refresh_tokens_token', 'refresh_tokens', ['token'], unique=True)
@@ -1,18 +1,104 @@
+import asyncio
+import secrets
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Request
 from .config import settings
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__time_cost=settings.ARGON2_TIME_COST,
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+# Argon2 is CPU-bound: run it in a bounded process pool and await the result,
+# so a login burst holds neither the event loop nor request threads while it
+# waits for a slot or a worker.
+_hash_executor: Optional[ProcessPoolExecutor] = None
+_hash_executor_lock = threading.Lock()
+_hash_slots = asyncio.Semaphore(max(1, settings.PASSWORD_HASH_CONCURRENCY))
+# Time spent in Argon2 itself (measured where it runs, without the wait for
+# a slot or a pool worker), used to estimate what throttling saves
+_hash_runs = 0
+_hash_seconds = 0.0
+_hash_stats_lock = threading.Lock()
 
-def get_password_hash(password: str) -> str:
+def _get_hash_executor() -> ProcessPoolExecutor:
+    global _hash_executor
+    if _hash_executor is None:
+        with _hash_executor_lock:
+            if _hash_executor is None:
+                _hash_executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+    return _hash_executor
+
+def shutdown_hash_executor():
+    global _hash_executor
+    with _hash_executor_lock:
+        if _hash_executor is not None:
+            _hash_executor.shutdown(cancel_futures=True)
+            _hash_executor = None
+
+def _record(timed_result):
+    global _hash_runs, _hash_seconds
+    result, elapsed = timed_result
+    with _hash_stats_lock:
+        _hash_runs += 1
+        _hash_seconds += elapsed
+    return result
+
+async def _run_hashing(fn, *args):
+    loop = asyncio.get_running_loop()
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        # No pool: the loop's default thread executor keeps the loop responsive
+        return _record(await loop.run_in_executor(None, _timed, fn, *args))
+    try:
+        await asyncio.wait_for(_hash_slots.acquire(), settings.PASSWORD_HASH_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, try again later"
+        )
+    try:
+        return _record(await loop.run_in_executor(_get_hash_executor(), _timed, fn, *args))
+    finally:
+        _hash_slots.release()
+
+def mean_hash_seconds() -> float:
+    with _hash_stats_lock:
+        return _hash_seconds / _hash_runs if _hash_runs else 0.0
+
+# Executed in the pool workers, so they must stay module-level functions
+def _timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+def _hash(password: str) -> str:
     return pwd_context.hash(password)
 
+def _verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return (await verify_and_update_password(plain_password, hashed_password))[0]
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password. When it matches but the stored hash was made with
+    outdated Argon2 parameters, a fresh hash is returned as the second item.
+    """
+    return await _run_hashing(_verify_and_update, plain_password, hashed_password)
+
+async def get_password_hash(password: str) -> str:
+    return await _run_hashing(_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -26,7 +112,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 def create_refresh_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
+    # jti keeps tokens issued to the same user within one second distinct
+    to_encode.update({"exp": expire, "type": "refresh", "jti": secrets.token_urlsafe(16)})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -0,0 +1,54 @@
+"""
+Conditional GET support: strong ETags built from row validators
+(id, updated_at, counters) and Last-Modified from `updated_at`.
+
+Validators are read with a narrow query that never touches large columns
+such as News.content, so a 304 costs one index lookup and no serialization.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, Optional, Sequence
+from fastapi import Request, Response
+
+def make_etag(rows: Iterable[Sequence], variant: Optional[Sequence[str]] = None) -> str:
+    """`variant` names the representation (e.g. sparse fields) of the same rows."""
+    digest = hashlib.blake2b(digest_size=16)
+    if variant:
+        digest.update(("fields:" + ",".join(variant) + "\n").encode())
+    for row in rows:
+        digest.update("|".join(str(value) for value in row).encode())
+        digest.update(b"\n")
+    return f'"{digest.hexdigest()}"'
+
+def _http_date(value: datetime) -> str:
+    # Timestamps are stored as naive UTC
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match wins over If-Modified-Since; GET uses weak comparison
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+    return False
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime] = None):
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = _http_date(last_modified)
+
+def not_modified(etag: str, last_modified: Optional[datetime] = None, headers: Optional[dict] = None) -> Response:
+    response = Response(status_code=304, headers=headers)
+    set_validators(response, etag, last_modified)
+    return response
@@ -0,0 +1,129 @@
+"""
+Maintenance of the denormalized counters News.comment_count,
+User.news_count and User.comment_count.
+
+The on_* hooks are called by crud inside the same transaction as the write
+they account for. repair_counters() recomputes every counter from scratch:
+
+    python -m app.counters [--batch-size 10000]
+"""
+import argparse
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Tuple
+from sqlalchemy import bindparam, func, select, text, update
+from sqlalchemy.orm import Session
+from . import models
+from .db import SessionLocal
+
+def add_to_counters(db: Session, model, field: str, deltas: Dict[int, int]):
+    """Add per-row deltas to a counter column with a single executemany UPDATE."""
+    deltas = {row_id: delta for row_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    table = model.__table__
+    values = {field: table.c[field] + bindparam("delta")}
+    if "updated_at" in table.c:
+        # Counters are part of the representation, keep Last-Modified honest
+        values["updated_at"] = datetime.utcnow()
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .values(values)
+    )
+    # Core executemany: ORM bulk UPDATE does not allow custom WHERE criteria
+    db.connection().execute(stmt, [{"row_id": row_id, "delta": delta} for row_id, delta in deltas.items()])
+
+def on_news_created(db: Session, author_id: int, count: int = 1):
+    add_to_counters(db, models.User, "news_count", {author_id: count})
+
+def on_news_deleted(db: Session, news_id: int, author_id: int):
+    # Comments of the news go away with it
+    per_author = db.execute(
+        select(models.Comment.author_id, func.count())
+        .where(models.Comment.news_id == news_id)
+        .group_by(models.Comment.author_id)
+    ).all()
+    add_to_counters(db, models.User, "comment_count", {user_id: -count for user_id, count in per_author})
+    add_to_counters(db, models.User, "news_count", {author_id: -1})
+
+def on_comments_created(db: Session, comments: Iterable[Tuple[int, int]]):
+    """`comments` are (news_id, author_id) pairs of the inserted rows."""
+    per_news, per_author = Counter(), Counter()
+    for news_id, author_id in comments:
+        per_news[news_id] += 1
+        per_author[author_id] += 1
+    add_to_counters(db, models.News, "comment_count", per_news)
+    add_to_counters(db, models.User, "comment_count", per_author)
+
+def on_comment_deleted(db: Session, news_id: int, author_id: int):
+    add_to_counters(db, models.News, "comment_count", {news_id: -1})
+    add_to_counters(db, models.User, "comment_count", {author_id: -1})
+
+def on_user_deleted(db: Session, user_id: int):
+    # The user's comments disappear from other authors' news
+    per_news = db.execute(
+        select(models.Comment.news_id, func.count())
+        .join(models.News, models.News.id == models.Comment.news_id)
+        .where(models.Comment.author_id == user_id, models.News.author_id != user_id)
+        .group_by(models.Comment.news_id)
+    ).all()
+    add_to_counters(db, models.News, "comment_count", {news_id: -count for news_id, count in per_news})
+
+    # Other users' comments disappear with the user's news
+    per_author = db.execute(
+        select(models.Comment.author_id, func.count())
+        .join(models.News, models.News.id == models.Comment.news_id)
+        .where(models.News.author_id == user_id, models.Comment.author_id != user_id)
+        .group_by(models.Comment.author_id)
+    ).all()
+    add_to_counters(db, models.User, "comment_count", {author_id: -count for author_id, count in per_author})
+
+_REPAIR_STATEMENTS = {
+    "news": [
+        "UPDATE news SET comment_count = "
+        "(SELECT count(*) FROM comments WHERE comments.news_id = news.id) "
+        "WHERE id >= :lo AND id < :hi",
+    ],
+    "users": [
+        "UPDATE users SET news_count = "
+        "(SELECT count(*) FROM news WHERE news.author_id = users.id) "
+        "WHERE id >= :lo AND id < :hi",
+        "UPDATE users SET comment_count = "
+        "(SELECT count(*) FROM comments WHERE comments.author_id = users.id) "
+        "WHERE id >= :lo AND id < :hi",
+    ],
+}
+
+def repair_counters(db: Session, batch_size: int = 10000) -> Dict[str, int]:
+    """
+    Recompute all counters in id ranges of `batch_size`, committing after each
+    range so locks stay short. Returns the number of rows updated per table.
+    """
+    repaired = {}
+    for table, statements in _REPAIR_STATEMENTS.items():
+        max_id = db.execute(text(f"SELECT max(id) FROM {table}")).scalar() or 0
+        updated = 0
+        for lo in range(0, max_id + 1, batch_size):
+            params = {"lo": lo, "hi": lo + batch_size}
+            for statement in statements:
+                result = db.execute(text(statement), params)
+            updated += result.rowcount
+            db.commit()
+        repaired[table] = updated
+    return repaired
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute denormalized comment/news counters")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        for table, updated in repair_counters(db, args.batch_size).items():
+            print(f"{table}: {updated} rows recomputed")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,28 @@
+import hashlib
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
-from . import models, schemas, auth
+from . import models, schemas, auth, counters, fieldsets, includes, search
+from .page_cache import news_pages
 from .config import settings
+from .pagination import clamp_limit, keyset_page
 from fastapi import HTTPException
-from typing import List, Optional
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional, Tuple
 
 # User CRUD operations
-def create_user_with_password(db: Session, user_in: schemas.UserCreate) -> models.User:
-    password_hash = auth.get_password_hash(user_in.password) if user_in.password else None
+# The password paths are async: Argon2 is awaited (see app.auth) and only the
+# short database calls take a threadpool thread. The session is closed before
+# hashing so a queued request does not hold a pooled connection either;
+# loaded objects stay readable and the session is reusable afterwards.
+async def create_user_with_password(db: Session, user_in: schemas.UserCreate) -> models.User:
+    password_hash = None
+    if user_in.password:
+        await run_in_threadpool(db.close)
+        password_hash = await auth.get_password_hash(user_in.password)
+    return await run_in_threadpool(create_user, db, user_in, password_hash)
+
+def create_user(db: Session, user_in: schemas.UserCreate, password_hash: Optional[str] = None) -> models.User:
     user = models.User(
         name=user_in.name,
         email=user_in.email,
@@ -46,32 +61,66 @@ def get_or_create_user_from_github(db: Session, github_user) -> models.User:
     db.refresh(user)
     return user
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[models.User]:
+def _get_user_and_close(db: Session, email: str) -> Optional[models.User]:
     user = get_user_by_email(db, email)
+    db.close()
+    return user
+
+def _set_password_hash(db: Session, user_id: int, password_hash: str):
+    db.execute(update(models.User).where(models.User.id == user_id).values(password_hash=password_hash))
+    db.commit()
+
+async def authenticate_user(db: Session, email: str, password: str) -> Optional[models.User]:
+    user = await run_in_threadpool(_get_user_and_close, db, email)
     if not user or not user.password_hash:
         return None
-    if not auth.verify_password(password, user.password_hash):
+    valid, new_hash = await auth.verify_and_update_password(password, user.password_hash)
+    if not valid:
         return None
+    if new_hash:
+        # Stored hash uses outdated Argon2 parameters, upgrade it transparently
+        await run_in_threadpool(_set_password_hash, db, user.id, new_hash)
+        user.password_hash = new_hash
     return user
 
-def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[models.User]:
-    return db.query(models.User).offset(skip).limit(limit).all()
+def _users_query(db: Session, fields: fieldsets.Fields = None):
+    query = db.query(models.User)
+    return query.options(fieldsets.USERS.load_only(fields)) if fields else query
 
-def get_user(db: Session, user_id: int) -> Optional[models.User]:
-    return db.query(models.User).filter(models.User.id == user_id).first()
+def get_users(db: Session, skip: int = 0, limit: int = 100, fields: fieldsets.Fields = None) -> List[models.User]:
+    return _users_query(db, fields).offset(skip).limit(clamp_limit(limit)).all()
+
+def get_users_page(db: Session, cursor: Optional[str] = None, limit: int = 100, fields: fieldsets.Fields = None) -> Tuple[List[models.User], Optional[str]]:
+    return keyset_page(_users_query(db, fields), models.User.registered_at, models.User.id, cursor, limit)
+
+def get_user(db: Session, user_id: int, fields: fieldsets.Fields = None) -> Optional[models.User]:
+    return _users_query(db, fields).filter(models.User.id == user_id).first()
 
 def get_user_by_email(db: Session, email: str) -> Optional[models.User]:
     return db.query(models.User).filter(models.User.email == email).first()
     
+def delete_user(db: Session, user: models.User):
+    """Delete a user; their news, comments and tokens are cascade deleted."""
+    counters.on_user_deleted(db, user.id)
+    search.remove_news_by_author(db, user.id)
+    db.delete(user)
+    db.commit()
+    # The cascade touches news and comment counts all over the place
+    news_pages.clear()
+
 def get_user_by_github_id(db: Session, github_id: str) -> Optional[models.User]:
     return db.query(models.User).filter(models.User.github_id == github_id).first()
 
 # Refresh Token operations
+# Tokens are stored and looked up by their sha256 digest, never in clear.
+def hash_refresh_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
 def create_refresh_token(db: Session, user_id: int, token: str, user_agent: str):
     expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     refresh_token = models.RefreshToken(
         user_id=user_id,
-        token=token,
+        token_hash=hash_refresh_token(token),
         user_agent=user_agent,
         expires_at=expires_at
     )
@@ -81,26 +130,42 @@ def create_refresh_token(db: Session, user_id: int, token: str, user_agent: str)
     return refresh_token
 
 def get_refresh_token(db: Session, token: str) -> Optional[models.RefreshToken]:
-    return db.query(models.RefreshToken).filter(models.RefreshToken.token == token).first()
-
-def update_refresh_token(db: Session, old_token: str, new_token: str, user_agent: str):
-    refresh_token = get_refresh_token(db, old_token)
-    if refresh_token:
-        expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-        refresh_token.token = new_token
-        refresh_token.user_agent = user_agent
-        refresh_token.expires_at = expires_at
-        db.commit()
-        db.refresh(refresh_token)
-    return refresh_token
+    return db.query(models.RefreshToken).filter(
+        models.RefreshToken.token_hash == hash_refresh_token(token)
+    ).first()
+
+def rotate_refresh_token(db: Session, user_id: int, old_token: str, new_token: str, user_agent: str) -> bool:
+    """
+    Replace a live refresh token with a new one in a single conditional UPDATE
+    (compare-and-swap on the old digest). Of several concurrent rotations of
+    the same token exactly one matches; the others get False.
+    """
+    now = datetime.utcnow()
+    result = db.execute(
+        update(models.RefreshToken)
+        .where(
+            models.RefreshToken.token_hash == hash_refresh_token(old_token),
+            models.RefreshToken.user_id == user_id,
+            models.RefreshToken.expires_at > now,
+        )
+        .values(
+            token_hash=hash_refresh_token(new_token),
+            user_agent=user_agent,
+            expires_at=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
 
 def delete_refresh_token(db: Session, token: str):
-    refresh_token = get_refresh_token(db, token)
-    if refresh_token:
-        db.delete(refresh_token)
-        db.commit()
-        return True
-    return False
+    result = db.execute(
+        delete(models.RefreshToken)
+        .where(models.RefreshToken.token_hash == hash_refresh_token(token))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount > 0
 
 def get_user_sessions(db: Session, user_id: int) -> List[models.RefreshToken]:
     return db.query(models.RefreshToken).filter(
@@ -117,15 +182,88 @@ def create_news(db: Session, news_in: schemas.NewsCreate, author_id: int):
         cover=news_in.cover
     )
     db.add(news)
+    counters.on_news_created(db, author_id)
+    db.flush()
+    search.index_news(db, news)
     db.commit()
+    news_pages.invalidate_inserts()
     db.refresh(news)
     return news
 
-def get_news(db: Session, skip: int = 0, limit: int = 100) -> List[models.News]:
-    return db.query(models.News).offset(skip).limit(limit).all()
+def create_news_batch(db: Session, items: List[schemas.NewsCreate], author_id: int) -> List[int]:
+    """Insert many news with one multi-row INSERT and one commit."""
+    if not items:
+        return []
+    rows = [
+        {"title": item.title, "content": item.content, "author_id": author_id, "cover": item.cover}
+        for item in items
+    ]
+    ids = db.execute(
+        insert(models.News).returning(models.News.id, sort_by_parameter_order=True), rows
+    ).scalars().all()
+    counters.on_news_created(db, author_id, len(ids))
+    search.index_news_many(db, [(news_id, item.title, item.content) for news_id, item in zip(ids, items)])
+    db.commit()
+    news_pages.invalidate_inserts()
+    return list(ids)
+
+def get_existing_news_ids(db: Session, news_ids) -> set:
+    """Return the subset of news_ids that exist, in a single query."""
+    if not news_ids:
+        return set()
+    return set(db.execute(select(models.News.id).where(models.News.id.in_(set(news_ids)))).scalars())
+
+def _news_query(db: Session, include=(), fields: fieldsets.Fields = None):
+    query = db.query(models.News)
+    if include:
+        query = query.options(*includes.news_load_options(include))
+    if fields:
+        query = query.options(fieldsets.NEWS.load_only(fields))
+    return query
+
+def _load_included(db: Session, items: List[models.News], include=()) -> List[models.News]:
+    """Embed the latest comments of the whole page with one extra query."""
+    if "comments" in include and items:
+        comments = db.execute(includes.latest_comments_statement([news.id for news in items])).scalars()
+        includes.attach_comments(items, comments)
+    return items
+
+def get_news(db: Session, skip: int = 0, limit: int = 100, include=(), fields: fieldsets.Fields = None) -> List[models.News]:
+    items = _news_query(db, include, fields).offset(skip).limit(clamp_limit(limit)).all()
+    return _load_included(db, items, include)
+
+def get_news_page(db: Session, cursor: Optional[str] = None, limit: int = 100, include=(), fields: fieldsets.Fields = None) -> Tuple[List[models.News], Optional[str]]:
+    items, next_cursor = keyset_page(_news_query(db, include, fields), models.News.published_at, models.News.id, cursor, limit)
+    return _load_included(db, items, include), next_cursor
+
+def search_news(db: Session, q: str, skip: int = 0, limit: int = 20) -> List[models.News]:
+    return search.search_news(db, q, skip=skip, limit=limit)
+
+# Narrow rows used for ETag / Last-Modified checks, without the content column
+NEWS_VALIDATOR_COLUMNS = (models.News.id, models.News.published_at, models.News.updated_at, models.News.comment_count)
+COMMENT_VALIDATOR_COLUMNS = (models.Comment.id, models.Comment.published_at, models.Comment.updated_at)
+
+def get_news_validators(db: Session, news_id: int):
+    return db.query(*NEWS_VALIDATOR_COLUMNS).filter(models.News.id == news_id).first()
 
-def get_news_by_id(db: Session, news_id: int) -> Optional[models.News]:
-    return db.query(models.News).filter(models.News.id == news_id).first()
+def get_news_validators_list(db: Session, skip: int = 0, limit: int = 100):
+    return db.query(*NEWS_VALIDATOR_COLUMNS).offset(skip).limit(clamp_limit(limit)).all()
+
+def get_news_validators_page(db: Session, cursor: Optional[str] = None, limit: int = 100):
+    return keyset_page(db.query(*NEWS_VALIDATOR_COLUMNS), models.News.published_at, models.News.id, cursor, limit)
+
+def get_news_by_ids(db: Session, news_ids: List[int], include=(), fields: fieldsets.Fields = None) -> List[models.News]:
+    """Load news by id in one query, keeping the order of `news_ids`."""
+    if not news_ids:
+        return []
+    by_id = {news.id: news for news in _news_query(db, include, fields).filter(models.News.id.in_(news_ids))}
+    return _load_included(db, [by_id[news_id] for news_id in news_ids if news_id in by_id], include)
+
+def get_news_by_id(db: Session, news_id: int, include=(), fields: fieldsets.Fields = None) -> Optional[models.News]:
+    news = _news_query(db, include, fields).filter(models.News.id == news_id).first()
+    if news is not None:
+        _load_included(db, [news], include)
+    return news
 
 def update_news(db: Session, news_id: int, news_update: schemas.NewsCreate):
     news = get_news_by_id(db, news_id)
@@ -134,8 +272,10 @@ def update_news(db: Session, news_id: int, news_update: schemas.NewsCreate):
     
     for field, value in news_update.dict(exclude_unset=True).items():
         setattr(news, field, value)
+    search.index_news(db, news)
     
     db.commit()
+    news_pages.invalidate_ids([news_id])
     db.refresh(news)
     return news
 
@@ -143,8 +283,11 @@ def delete_news(db: Session, news_id: int):
     news = get_news_by_id(db, news_id)
     if not news:
         return False
+    counters.on_news_deleted(db, news.id, news.author_id)
+    search.remove_news(db, news.id)
     db.delete(news)
     db.commit()
+    news_pages.invalidate_deletes([news_id])
     return True
 
 # Comment CRUD operations
@@ -160,12 +303,37 @@ def create_comment(db: Session, comment_in: schemas.CommentCreate, author_id: in
         author_id=author_id
     )
     db.add(comment)
+    counters.on_comments_created(db, [(comment_in.news_id, author_id)])
     db.commit()
+    news_pages.invalidate_ids([comment_in.news_id])
     db.refresh(comment)
     return comment
 
+def create_comments_batch(db: Session, items: List[schemas.CommentCreate], author_id: int) -> List[int]:
+    """
+    Insert many comments with one multi-row INSERT and one commit.
+    Referenced news must already be checked with get_existing_news_ids.
+    """
+    if not items:
+        return []
+    rows = [{"text": item.text, "news_id": item.news_id, "author_id": author_id} for item in items]
+    ids = db.execute(
+        insert(models.Comment).returning(models.Comment.id, sort_by_parameter_order=True), rows
+    ).scalars().all()
+    counters.on_comments_created(db, [(item.news_id, author_id) for item in items])
+    db.commit()
+    news_pages.invalidate_ids({item.news_id for item in items})
+    return list(ids)
+
 def get_comments(db: Session, skip: int = 0, limit: int = 100) -> List[models.Comment]:
-    return db.query(models.Comment).offset(skip).limit(limit).all()
+    return db.query(models.Comment).offset(skip).limit(clamp_limit(limit)).all()
+
+def get_comments_page(db: Session, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[models.Comment], Optional[str]]:
+    return keyset_page(db.query(models.Comment), models.Comment.published_at, models.Comment.id, cursor, limit)
+
+def comment_validators(comment: models.Comment) -> tuple:
+    # Comments have no large column, so ETags are computed from the loaded rows
+    return tuple(getattr(comment, column.key) for column in COMMENT_VALIDATOR_COLUMNS)
 
 def get_comment_by_id(db: Session, comment_id: int) -> Optional[models.Comment]:
     return db.query(models.Comment).filter(models.Comment.id == comment_id).first()
@@ -183,8 +351,11 @@ def delete_comment(db: Session, comment_id: int):
     comment = get_comment_by_id(db, comment_id)
     if not comment:
         return False
+    news_id = comment.news_id
+    counters.on_comment_deleted(db, news_id, comment.author_id)
     db.delete(comment)
     db.commit()
+    news_pages.invalidate_ids([news_id])
     return True
 
 def get_comments_by_news(db: Session, news_id: int, skip: int = 0, limit: int = 100) -> List[models.Comment]:
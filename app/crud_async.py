@@ -0,0 +1,265 @@
+# Async counterparts of app/crud.py for the ASYNC_DB path
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+from typing import List, Optional, Tuple
+from . import models, schemas, auth, counters, fieldsets, includes, search
+from .crud import NEWS_VALIDATOR_COLUMNS, comment_validators
+from .page_cache import news_pages
+from .pagination import clamp_limit, keyset_statement, split_page
+
+async def _keyset_page(db: AsyncSession, model, sort_column, cursor: Optional[str], limit: int, options=()):
+    stmt = keyset_statement(select(model).options(*options), sort_column, model.id, cursor, limit)
+    items = (await db.execute(stmt)).scalars().all()
+    return split_page(items, sort_column, model.id, limit)
+
+async def _validators_page(db: AsyncSession, columns, sort_column, id_column, cursor: Optional[str], limit: int):
+    rows = (await db.execute(keyset_statement(select(*columns), sort_column, id_column, cursor, limit))).all()
+    return split_page(rows, sort_column, id_column, limit)
+
+# User CRUD operations
+async def create_user_with_password(db: AsyncSession, user_in: schemas.UserCreate) -> models.User:
+    password_hash = await auth.get_password_hash(user_in.password) if user_in.password else None
+    user = models.User(
+        name=user_in.name,
+        email=user_in.email,
+        password_hash=password_hash,
+        avatar=user_in.avatar,
+    )
+    db.add(user)
+    await db.commit()
+    await db.refresh(user)
+    return user
+
+def _users_options(fields: fieldsets.Fields) -> list:
+    return [fieldsets.USERS.load_only(fields)] if fields else []
+
+async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100, fields: fieldsets.Fields = None) -> List[models.User]:
+    stmt = select(models.User).options(*_users_options(fields)).offset(skip).limit(clamp_limit(limit))
+    result = await db.execute(stmt)
+    return result.scalars().all()
+
+async def get_users_page(db: AsyncSession, cursor: Optional[str] = None, limit: int = 100, fields: fieldsets.Fields = None) -> Tuple[List[models.User], Optional[str]]:
+    return await _keyset_page(db, models.User, models.User.registered_at, cursor, limit, options=_users_options(fields))
+
+async def get_user(db: AsyncSession, user_id: int, fields: fieldsets.Fields = None) -> Optional[models.User]:
+    return await db.get(models.User, user_id, options=_users_options(fields))
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[models.User]:
+    result = await db.execute(select(models.User).filter(models.User.email == email))
+    return result.scalars().first()
+
+async def update_user(db: AsyncSession, user: models.User, user_update: schemas.UserUpdate) -> models.User:
+    for field, value in user_update.dict(exclude_unset=True).items():
+        setattr(user, field, value)
+    await db.commit()
+    await db.refresh(user)
+    return user
+
+async def delete_user(db: AsyncSession, user: models.User):
+    await db.run_sync(counters.on_user_deleted, user.id)
+    await db.run_sync(search.remove_news_by_author, user.id)
+    await db.delete(user)
+    await db.commit()
+    news_pages.clear()
+
+# News CRUD operations
+async def create_news(db: AsyncSession, news_in: schemas.NewsCreate, author_id: int):
+    news = models.News(
+        title=news_in.title,
+        content=news_in.content,
+        author_id=author_id,
+        cover=news_in.cover
+    )
+    db.add(news)
+    await db.run_sync(counters.on_news_created, author_id)
+    await db.flush()
+    await db.run_sync(search.index_news, news)
+    await db.commit()
+    news_pages.invalidate_inserts()
+    await db.refresh(news)
+    return news
+
+async def create_news_batch(db: AsyncSession, items: List[schemas.NewsCreate], author_id: int) -> List[int]:
+    """Insert many news with one multi-row INSERT and one commit."""
+    if not items:
+        return []
+    rows = [
+        {"title": item.title, "content": item.content, "author_id": author_id, "cover": item.cover}
+        for item in items
+    ]
+    ids = (await db.execute(
+        insert(models.News).returning(models.News.id, sort_by_parameter_order=True), rows
+    )).scalars().all()
+    await db.run_sync(counters.on_news_created, author_id, len(ids))
+    await db.run_sync(search.index_news_many, [(news_id, item.title, item.content) for news_id, item in zip(ids, items)])
+    await db.commit()
+    news_pages.invalidate_inserts()
+    return list(ids)
+
+async def get_existing_news_ids(db: AsyncSession, news_ids) -> set:
+    """Return the subset of news_ids that exist, in a single query."""
+    if not news_ids:
+        return set()
+    result = await db.execute(select(models.News.id).where(models.News.id.in_(set(news_ids))))
+    return set(result.scalars())
+
+def _news_options(include=(), fields: fieldsets.Fields = None) -> list:
+    options = includes.news_load_options(include) if include else []
+    if fields:
+        options.append(fieldsets.NEWS.load_only(fields))
+    return options
+
+async def _load_included(db: AsyncSession, items: List[models.News], include=()) -> List[models.News]:
+    if "comments" in include and items:
+        result = await db.execute(includes.latest_comments_statement([news.id for news in items]))
+        includes.attach_comments(items, result.scalars())
+    return items
+
+async def get_news(db: AsyncSession, skip: int = 0, limit: int = 100, include=(), fields: fieldsets.Fields = None) -> List[models.News]:
+    stmt = select(models.News).options(*_news_options(include, fields)).offset(skip).limit(clamp_limit(limit))
+    items = (await db.execute(stmt)).unique().scalars().all()
+    return await _load_included(db, items, include)
+
+async def get_many(db: AsyncSession, model, ids) -> list:
+    """Rows of `model` for `ids` in one IN query, in the order of `ids`."""
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        return []
+    result = await db.execute(select(model).where(model.id.in_(ids)))
+    by_id = {obj.id: obj for obj in result.scalars()}
+    return [by_id[id] for id in ids if id in by_id]
+
+async def get_news_page(db: AsyncSession, cursor: Optional[str] = None, limit: int = 100, include=(), fields: fieldsets.Fields = None) -> Tuple[List[models.News], Optional[str]]:
+    items, next_cursor = await _keyset_page(
+        db, models.News, models.News.published_at, cursor, limit, options=_news_options(include, fields)
+    )
+    return await _load_included(db, items, include), next_cursor
+
+async def get_news_by_ids(db: AsyncSession, news_ids: List[int], include=(), fields: fieldsets.Fields = None) -> List[models.News]:
+    """Load news by id in one query, keeping the order of `news_ids`."""
+    if not news_ids:
+        return []
+    stmt = select(models.News).options(*_news_options(include, fields)).where(models.News.id.in_(news_ids))
+    by_id = {news.id: news for news in (await db.execute(stmt)).unique().scalars()}
+    return await _load_included(db, [by_id[news_id] for news_id in news_ids if news_id in by_id], include)
+
+async def get_news_validators(db: AsyncSession, news_id: int):
+    return (await db.execute(select(*NEWS_VALIDATOR_COLUMNS).where(models.News.id == news_id))).first()
+
+async def get_news_validators_list(db: AsyncSession, skip: int = 0, limit: int = 100):
+    return (await db.execute(select(*NEWS_VALIDATOR_COLUMNS).offset(skip).limit(clamp_limit(limit)))).all()
+
+async def get_news_validators_page(db: AsyncSession, cursor: Optional[str] = None, limit: int = 100):
+    return await _validators_page(db, NEWS_VALIDATOR_COLUMNS, models.News.published_at, models.News.id, cursor, limit)
+
+async def search_news(db: AsyncSession, q: str, skip: int = 0, limit: int = 20) -> List[models.News]:
+    return await db.run_sync(search.search_news, q, skip, limit)
+
+async def get_news_by_id(db: AsyncSession, news_id: int, include=(), fields: fieldsets.Fields = None) -> Optional[models.News]:
+    if not include and not fields:
+        return await db.get(models.News, news_id)
+    news = await db.get(models.News, news_id, options=_news_options(include, fields), populate_existing=True)
+    if news is not None:
+        await _load_included(db, [news], include)
+    return news
+
+async def update_news(db: AsyncSession, news_id: int, news_update: schemas.NewsCreate):
+    news = await get_news_by_id(db, news_id)
+    if not news:
+        return None
+
+    for field, value in news_update.dict(exclude_unset=True).items():
+        setattr(news, field, value)
+    await db.run_sync(search.index_news, news)
+
+    await db.commit()
+    news_pages.invalidate_ids([news_id])
+    await db.refresh(news)
+    return news
+
+async def delete_news(db: AsyncSession, news_id: int):
+    news = await get_news_by_id(db, news_id)
+    if not news:
+        return False
+    await db.run_sync(counters.on_news_deleted, news.id, news.author_id)
+    await db.run_sync(search.remove_news, news.id)
+    await db.delete(news)
+    await db.commit()
+    news_pages.invalidate_deletes([news_id])
+    return True
+
+# Comment CRUD operations
+async def create_comment(db: AsyncSession, comment_in: schemas.CommentCreate, author_id: int):
+    # Check if news exists
+    news = await get_news_by_id(db, comment_in.news_id)
+    if not news:
+        raise HTTPException(status_code=404, detail="News not found")
+
+    comment = models.Comment(
+        text=comment_in.text,
+        news_id=comment_in.news_id,
+        author_id=author_id
+    )
+    db.add(comment)
+    await db.run_sync(counters.on_comments_created, [(comment_in.news_id, author_id)])
+    await db.commit()
+    news_pages.invalidate_ids([comment_in.news_id])
+    await db.refresh(comment)
+    return comment
+
+async def create_comments_batch(db: AsyncSession, items: List[schemas.CommentCreate], author_id: int) -> List[int]:
+    """
+    Insert many comments with one multi-row INSERT and one commit.
+    Referenced news must already be checked with get_existing_news_ids.
+    """
+    if not items:
+        return []
+    rows = [{"text": item.text, "news_id": item.news_id, "author_id": author_id} for item in items]
+    ids = (await db.execute(
+        insert(models.Comment).returning(models.Comment.id, sort_by_parameter_order=True), rows
+    )).scalars().all()
+    await db.run_sync(counters.on_comments_created, [(item.news_id, author_id) for item in items])
+    await db.commit()
+    news_pages.invalidate_ids({item.news_id for item in items})
+    return list(ids)
+
+async def get_comments(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[models.Comment]:
+    result = await db.execute(select(models.Comment).offset(skip).limit(clamp_limit(limit)))
+    return result.scalars().all()
+
+async def get_comments_page(db: AsyncSession, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[models.Comment], Optional[str]]:
+    return await _keyset_page(db, models.Comment, models.Comment.published_at, cursor, limit)
+
+async def get_comment_by_id(db: AsyncSession, comment_id: int) -> Optional[models.Comment]:
+    return await db.get(models.Comment, comment_id)
+
+async def update_comment(db: AsyncSession, comment_id: int, text: str):
+    comment = await get_comment_by_id(db, comment_id)
+    if not comment:
+        return None
+    comment.text = text
+    await db.commit()
+    await db.refresh(comment)
+    return comment
+
+async def delete_comment(db: AsyncSession, comment_id: int):
+    comment = await get_comment_by_id(db, comment_id)
+    if not comment:
+        return False
+    news_id = comment.news_id
+    await db.run_sync(counters.on_comment_deleted, comment.news_id, comment.author_id)
+    await db.delete(comment)
+    await db.commit()
+    news_pages.invalidate_ids([news_id])
+    return True
+
+async def get_comments_by_news(db: AsyncSession, news_id: int, skip: int = 0, limit: int = 100) -> List[models.Comment]:
+    result = await db.execute(
+        select(models.Comment)
+        .filter(models.Comment.news_id == news_id)
+        .order_by(models.Comment.published_at.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return result.scalars().all()
@@ -0,0 +1,121 @@
+"""
+Request-scoped dataloaders: id lookups are collected and resolved with one
+batch query (repository `get_many`) instead of one query per id, and every
+object is loaded at most once per request.
+
+    loaders.news.prime(1, 2, 3)       # queue ids, nothing is loaded yet
+    loaders.news.load(2)              # one IN query for 1, 2 and 3
+    loaders.news.load_many([3, 4])    # only 4 is fetched
+
+AsyncDataLoader does the same for async code: `load()` calls awaited
+concurrently in one event loop iteration share a single batch call.
+"""
+import asyncio
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Optional, Sequence, TypeVar
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from . import crud_async, models
+from .repositories.sqlalchemy_repo import SQLAlchemyRepository
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+def _key_of(obj: Any) -> Any:
+    return obj["id"] if isinstance(obj, dict) else obj.id
+
+class DataLoader(Generic[K, V]):
+    def __init__(self, batch_load: Callable[[List[K]], Iterable[V]], key: Callable[[V], K] = _key_of):
+        self.batch_load = batch_load
+        self.key = key
+        self._cache: Dict[K, Optional[V]] = {}
+        self._pending: Dict[K, None] = {}
+        self.batches = 0
+
+    def prime(self, *keys: K):
+        """Queue keys for the next batch."""
+        for key in keys:
+            if key not in self._cache:
+                self._pending[key] = None
+
+    def dispatch(self):
+        if not self._pending:
+            return
+        keys = list(self._pending)
+        self._pending.clear()
+        self.batches += 1
+        for key in keys:
+            self._cache[key] = None
+        for obj in self.batch_load(keys):
+            self._cache[self.key(obj)] = obj
+
+    def load(self, key: K) -> Optional[V]:
+        self.prime(key)
+        self.dispatch()
+        return self._cache.get(key)
+
+    def load_many(self, keys: Sequence[K]) -> List[V]:
+        """Found objects in the order of `keys`; missing keys are skipped."""
+        self.prime(*keys)
+        self.dispatch()
+        return [self._cache[key] for key in dict.fromkeys(keys) if self._cache.get(key) is not None]
+
+    def clear(self, key: K):
+        """Forget a key after the object was changed or deleted."""
+        self._cache.pop(key, None)
+
+class AsyncDataLoader(Generic[K, V]):
+    def __init__(self, batch_load: Callable[[List[K]], Awaitable[Iterable[V]]], key: Callable[[V], K] = _key_of):
+        self.batch_load = batch_load
+        self.key = key
+        self._cache: Dict[K, "asyncio.Future[Optional[V]]"] = {}
+        self._pending: Dict[K, "asyncio.Future[Optional[V]]"] = {}
+        self.batches = 0
+
+    def load(self, key: K) -> "asyncio.Future[Optional[V]]":
+        future = self._cache.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._cache[key] = future
+            if not self._pending:
+                # Let every coroutine scheduled in this iteration add its keys first
+                loop.call_soon(lambda: asyncio.ensure_future(self._dispatch()))
+            self._pending[key] = future
+        return future
+
+    async def load_many(self, keys: Sequence[K]) -> List[V]:
+        results = await asyncio.gather(*(self.load(key) for key in dict.fromkeys(keys)))
+        return [obj for obj in results if obj is not None]
+
+    async def _dispatch(self):
+        pending, self._pending = self._pending, {}
+        self.batches += 1
+        try:
+            found = {self.key(obj): obj for obj in await self.batch_load(list(pending))}
+        except Exception as e:
+            for key, future in pending.items():
+                self._cache.pop(key, None)
+                future.set_exception(e)
+            return
+        for key, future in pending.items():
+            future.set_result(found.get(key))
+
+    def clear(self, key: K):
+        self._cache.pop(key, None)
+
+class Loaders:
+    """One loader per model, created for each request by dependencies.get_loaders."""
+
+    def __init__(self, db: Session):
+        self.users = DataLoader(SQLAlchemyRepository(db, models.User).get_many)
+        self.news = DataLoader(SQLAlchemyRepository(db, models.News).get_many)
+        self.comments = DataLoader(SQLAlchemyRepository(db, models.Comment).get_many)
+
+class AsyncLoaders:
+    """AsyncSession counterpart of Loaders (dependencies.get_loaders_async)."""
+
+    def __init__(self, db: AsyncSession):
+        self.users = AsyncDataLoader(partial(crud_async.get_many, db, models.User))
+        self.news = AsyncDataLoader(partial(crud_async.get_many, db, models.News))
+        self.comments = AsyncDataLoader(partial(crud_async.get_many, db, models.Comment))
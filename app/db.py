@@ -1,17 +1,65 @@
 import os
-from sqlalchemy import create_engine
+import threading
+import time
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker, declarative_base
-from typing import Generator
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from typing import AsyncGenerator, Generator
 from .config import settings
+from . import metrics
+from .metrics import Histogram
 
 # Database configuration - используем настройки из config
 DATABASE_URL = settings.DATABASE_URL
 
+# Time spent waiting for a pooled connection, and checkouts that timed out
+pool_wait = Histogram()
+pool_timeouts = 0
+_timeouts_lock = threading.Lock()
+
+class _TimedCheckoutMixin:
+    def _do_get(self):
+        global pool_timeouts
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with _timeouts_lock:
+                pool_timeouts += 1
+            raise
+        finally:
+            pool_wait.observe(time.perf_counter() - started)
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+def _is_memory_sqlite(url: str) -> bool:
+    # In-memory SQLite needs its own single-connection pool
+    return url.startswith("sqlite") and (":memory:" in url or url.split("://", 1)[-1] in ("", "/"))
+
+def engine_options(url: str, poolclass) -> dict:
+    options = {"echo": settings.DB_ECHO, "pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if not _is_memory_sqlite(url):
+        options.update(
+            poolclass=poolclass,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    return options
+
 # Для SQLite нужно добавить check_same_thread только для SQLite
 if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False}, echo=True)
+    engine = create_engine(
+        DATABASE_URL, connect_args={"check_same_thread": False}, **engine_options(DATABASE_URL, TimedQueuePool)
+    )
 else:
-    engine = create_engine(DATABASE_URL, echo=True)
+    engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL, TimedQueuePool))
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 Base = declarative_base()
@@ -22,3 +70,86 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+# Async path (ASYNC_DB=true): asyncpg for PostgreSQL, aiosqlite for SQLite
+def get_async_database_url(url: str) -> str:
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.ASYNC_DB:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    ASYNC_DATABASE_URL = get_async_database_url(DATABASE_URL)
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, TimedAsyncAdaptedQueuePool)
+    )
+    # Objects are returned after commit, so keep their state loaded
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+async def get_async_db() -> AsyncGenerator:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def pool_status(bind) -> dict:
+    pool = bind.pool
+    status = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            # Negative until the pool has opened pool_size connections
+            overflow=max(pool.overflow(), 0),
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            timeout=pool.timeout(),
+        )
+    return status
+
+def check_database() -> dict:
+    """Pool state, checkout wait times and the latency of a probe query."""
+    report = {"status": "healthy", "sync": pool_status(engine)}
+    if async_engine is not None:
+        report["async"] = pool_status(async_engine.sync_engine)
+    report["wait_seconds"] = pool_wait.snapshot()
+    report["timeouts"] = pool_timeouts
+
+    started = time.perf_counter()
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception as e:
+        report.update(status="unhealthy", error=str(e))
+    report["probe_latency_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return report
+
+def _collect_pool_metrics():
+    lines = [
+        "# HELP db_pool_connections Pooled connections by state",
+        "# TYPE db_pool_connections gauge",
+    ]
+    binds = [("sync", engine)] + ([("async", async_engine.sync_engine)] if async_engine is not None else [])
+    for name, bind in binds:
+        status = pool_status(bind)
+        for state in ("checked_out", "idle", "overflow"):
+            if state in status:
+                lines.append(f'db_pool_connections{{engine="{name}",state="{state}"}} {status[state]}')
+    lines += [
+        "# HELP db_pool_wait_seconds Time spent waiting for a pooled connection",
+        "# TYPE db_pool_wait_seconds histogram",
+        *metrics.histogram_lines("db_pool_wait_seconds", pool_wait),
+        "# HELP db_pool_timeouts_total Connection checkouts that hit the pool timeout",
+        "# TYPE db_pool_timeouts_total counter",
+        f"db_pool_timeouts_total {pool_timeouts}",
+    ]
+    return lines
+
+metrics.register_collector(_collect_pool_metrics)
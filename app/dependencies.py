@@ -1,11 +1,18 @@
 # dependencies.py
+import hashlib
+import secrets
+import threading
+import time
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
-from app.db import get_db
+from app.db import get_db, get_async_db
 from app import models, schemas
+from app.cache import TTLCache
+from app.dataloader import AsyncLoaders, Loaders
 from app.config import settings
 
 # OAuth2 scheme
@@ -25,7 +32,8 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
 def create_refresh_token(data: dict):
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     to_encode = data.copy()
-    to_encode.update({"exp": expire, "type": "refresh"})
+    # jti keeps tokens issued to the same user within one second distinct
+    to_encode.update({"exp": expire, "type": "refresh", "jti": secrets.token_urlsafe(16)})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -39,38 +47,82 @@ def verify_token(token: str):
 def get_user_agent(request: Request) -> str:
     return request.headers.get("user-agent", "unknown")
 
-# Password hashing context
-from passlib.context import CryptContext
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
-
 # Dependency functions
-async def get_current_user(
-    db: Session = Depends(get_db),
-    token: str = Depends(oauth2_scheme)
-):
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    
+
+# Claims of already verified access tokens keyed by token digest. Each entry
+# expires together with its token, so a cached token is never accepted longer
+# than jwt.decode would accept it.
+token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+_decode_stats_lock = threading.Lock()
+_decode_stats = {"decodes": 0, "decode_seconds": 0.0}
+
+def _token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+def decode_access_token(token: str) -> dict:
+    """jwt.decode with a cache of verified claims. Raises JWTError."""
+    key = _token_key(token)
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
+
+    start = time.perf_counter()
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    elapsed = time.perf_counter() - start
+    with _decode_stats_lock:
+        _decode_stats["decodes"] += 1
+        _decode_stats["decode_seconds"] += elapsed
+
+    exp = payload.get("exp")
+    if exp is not None:
+        token_cache.set(key, payload, ttl=exp - time.time())
+    return payload
+
+def evict_token(token: str) -> bool:
+    """Drop a token from the verified-token cache (logout / revocation)."""
+    return token_cache.pop(_token_key(token))
+
+def token_cache_stats() -> dict:
+    stats = token_cache.stats()
+    with _decode_stats_lock:
+        decodes = _decode_stats["decodes"]
+        decode_seconds = _decode_stats["decode_seconds"]
+    avg_decode = decode_seconds / decodes if decodes else 0.0
+    stats.update({
+        "decodes": decodes,
+        "avg_decode_ms": avg_decode * 1000,
+        # Every hit skips one signature verification
+        "saved_decode_ms": stats["hits"] * avg_decode * 1000,
+    })
+    return stats
+
+def _get_user_id_from_token(token: str) -> int:
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = decode_access_token(token)
         user_id: int = payload.get("user_id")
         if user_id is None:
-            raise credentials_exception
+            raise _credentials_exception()
     except JWTError:
-        raise credentials_exception
-    
+        raise _credentials_exception()
+    return user_id
+
+async def get_current_user(
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme)
+):
+    user_id = _get_user_id_from_token(token)
     user = db.query(models.User).filter(models.User.id == user_id).first()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     return user
 
 async def get_current_active_user(current_user: models.User = Depends(get_current_user)):
@@ -134,3 +186,57 @@ def require_admin(current_user: models.User = Depends(get_current_user)):
 # Additional utility dependency to get database session
 def get_db_session(db: Session = Depends(get_db)):
     return db
+
+def get_loaders(db: Session = Depends(get_db)) -> Loaders:
+    return Loaders(db)
+
+# Async counterparts used by the ASYNC_DB routers
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(oauth2_scheme)
+):
+    user_id = _get_user_id_from_token(token)
+    user = await db.get(models.User, user_id)
+    if user is None:
+        raise _credentials_exception()
+    return user
+
+async def require_verified_author_async(current_user: models.User = Depends(get_current_user_async)):
+    return require_verified_author(current_user)
+
+async def require_admin_async(current_user: models.User = Depends(get_current_user_async)):
+    return require_admin(current_user)
+
+async def check_news_ownership_async(
+    news_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    news = await db.get(models.News, news_id)
+    if not news:
+        raise HTTPException(status_code=404, detail="News not found")
+
+    if news.author_id != current_user.id and not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to modify this news"
+        )
+    return news
+
+async def check_comment_ownership_async(
+    comment_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(get_current_user_async)
+):
+    comment = await db.get(models.Comment, comment_id)
+    if not comment:
+        raise HTTPException(status_code=404, detail="Comment not found")
+    if comment.author_id != current_user.id and not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to modify this comment"
+        )
+    return comment
+
+async def get_loaders_async(db: AsyncSession = Depends(get_async_db)) -> AsyncLoaders:
+    return AsyncLoaders(db)
@@ -0,0 +1,63 @@
+"""
+NDJSON export of news and comments.
+
+Rows are read as plain column tuples in chunks of EXPORT_CHUNK_SIZE
+(`yield_per`, a server-side cursor on PostgreSQL) and each chunk is encoded
+and sent before the next one is fetched, so memory does not grow with the
+size of the export. The generators open their own session because they keep
+running after the request handler has returned.
+"""
+import json
+from datetime import datetime
+from typing import Iterator, Optional
+from sqlalchemy import select
+from . import models
+from .config import settings
+from .db import SessionLocal
+
+NEWS_EXPORT_COLUMNS = (
+    models.News.id,
+    models.News.title,
+    models.News.content,
+    models.News.published_at,
+    models.News.author_id,
+    models.News.cover,
+    models.News.comment_count,
+)
+
+COMMENT_EXPORT_COLUMNS = (
+    models.Comment.id,
+    models.Comment.text,
+    models.Comment.news_id,
+    models.Comment.author_id,
+    models.Comment.published_at,
+)
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+def _iter_ndjson(model, columns, published_from: Optional[datetime], published_to: Optional[datetime]) -> Iterator[bytes]:
+    stmt = select(*columns)
+    if published_from is not None:
+        stmt = stmt.where(model.published_at >= published_from)
+    if published_to is not None:
+        stmt = stmt.where(model.published_at < published_to)
+    stmt = stmt.order_by(model.published_at, model.id).execution_options(yield_per=settings.EXPORT_CHUNK_SIZE)
+
+    db = SessionLocal()
+    try:
+        for chunk in db.execute(stmt).partitions():
+            yield "".join(
+                json.dumps(row._asdict(), default=_json_default, ensure_ascii=False) + "\n"
+                for row in chunk
+            ).encode()
+    finally:
+        db.close()
+
+def iter_news_ndjson(published_from: Optional[datetime] = None, published_to: Optional[datetime] = None) -> Iterator[bytes]:
+    return _iter_ndjson(models.News, NEWS_EXPORT_COLUMNS, published_from, published_to)
+
+def iter_comments_ndjson(published_from: Optional[datetime] = None, published_to: Optional[datetime] = None) -> Iterator[bytes]:
+    return _iter_ndjson(models.Comment, COMMENT_EXPORT_COLUMNS, published_from, published_to)
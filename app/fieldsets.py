@@ -0,0 +1,59 @@
+"""
+Sparse fieldsets: `?fields=id,title,cover` or a named view such as
+`?fields=summary` on news and user reads.
+
+Only the requested columns are selected (`load_only`), so a headline feed
+never reads or transfers News.content. `id` is always returned; the columns
+in `always` are also loaded (they are small and feed ETags and keyset
+cursors) but are returned only when requested.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Set, Tuple, Type
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy.orm import load_only
+from . import models, schemas
+
+Fields = Optional[Tuple[str, ...]]
+
+@dataclass(frozen=True)
+class Fieldset:
+    model: type
+    schema: Type[BaseModel]
+    views: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    always: Tuple[str, ...] = ("id",)
+
+    def parse(self, value: Optional[str]) -> Fields:
+        """Requested field names, or None for the full representation."""
+        if not value:
+            return None
+        if value in self.views:
+            return self.views[value]
+        names = [part.strip() for part in value.split(",") if part.strip()]
+        unknown = [name for name in names if name not in self.schema.model_fields]
+        if unknown:
+            allowed = ", ".join([*self.schema.model_fields, *self.views])
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}; allowed: {allowed}")
+        return tuple(dict.fromkeys(["id", *names]))
+
+    def load_only(self, fields: Tuple[str, ...]):
+        columns = dict.fromkeys([*self.always, *fields])
+        return load_only(*(getattr(self.model, name) for name in columns))
+
+    def exclude(self, fields: Fields) -> Set[str]:
+        """Schema fields to leave out of the response."""
+        return set() if fields is None else set(self.schema.model_fields).difference(fields)
+
+NEWS = Fieldset(
+    models.News,
+    schemas.NewsRead,
+    views={"summary": ("id", "title", "cover", "published_at", "author_id", "comment_count")},
+    always=("id", "published_at", "updated_at", "comment_count"),
+)
+
+USERS = Fieldset(
+    models.User,
+    schemas.UserRead,
+    views={"summary": ("id", "name", "avatar", "is_verified_author")},
+    always=("id", "registered_at"),
+)
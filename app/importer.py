@@ -0,0 +1,246 @@
+"""
+Bulk import of news and comments from NDJSON or CSV files.
+
+    python -m app.importer news archive.ndjson
+    python -m app.importer comments comments.csv --format csv --chunk-size 5000
+
+News records: title, content, cover (optional), author_email,
+published_at (optional, ISO 8601). In CSV files `content` is a JSON string.
+Comment records: text, news_id, author_email, published_at (optional).
+
+Records are validated with schemas.NewsCreate / CommentCreate, authors are
+resolved by email with one query per chunk, and every chunk is loaded with
+COPY on PostgreSQL (psycopg2) or one executemany INSERT elsewhere, then
+committed together with the counter updates. Rejected records are counted
+and a sample of them is reported with their line number and reason.
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+from . import counters, models, schemas, search
+from .db import SessionLocal
+
+# Columns that must never be read as NULL from an empty CSV field by COPY
+NOT_NULL_COLUMNS = {"news": ("title", "content"), "comments": ("text",)}
+
+@dataclass
+class ImportReport:
+    read: int = 0
+    imported: int = 0
+    rejected_count: int = 0
+    # First rejected records (line number, reason); the rest are only counted
+    rejected: List[Tuple[int, str]] = field(default_factory=list)
+    max_rejected: int = 1000
+    started: float = field(default_factory=time.perf_counter)
+
+    def reject(self, line_num: int, reason: str):
+        self.rejected_count += 1
+        if len(self.rejected) < self.max_rejected:
+            self.rejected.append((line_num, reason))
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def summary(self) -> str:
+        rate = self.imported / self.elapsed if self.elapsed else 0.0
+        return (f"read {self.read}, imported {self.imported}, rejected {self.rejected_count} "
+                f"in {self.elapsed:.1f}s ({rate:.0f} rows/s)")
+
+def read_records(path: str, fmt: str) -> Iterator[Tuple[int, dict]]:
+    """Yield (line number, record) pairs without loading the whole file."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            for record in reader:
+                if record.get("content"):
+                    try:
+                        record["content"] = json.loads(record["content"])
+                    except ValueError:
+                        pass
+                yield reader.line_num, record
+        else:
+            for line_num, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield line_num, {"_error": f"invalid JSON: {e}"}
+                    continue
+                if not isinstance(record, dict):
+                    record = {"_error": "record must be a JSON object"}
+                yield line_num, record
+
+def _published_at(record: dict) -> datetime:
+    value = record.get("published_at")
+    if not value:
+        return datetime.utcnow()
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+def copy_statement(table: str, columns: List[str], not_null: Tuple[str, ...]) -> str:
+    """
+    COPY ... FROM STDIN in CSV format. Empty unquoted fields are NULL in COPY,
+    which is how missing optional values are written; FORCE_NOT_NULL makes an
+    empty value of the required columns an empty string instead.
+    """
+    return (f"COPY {table} ({', '.join(columns)}) FROM STDIN "
+            f"WITH (FORMAT csv, FORCE_NOT_NULL ({', '.join(not_null)}))")
+
+class Importer:
+    def __init__(self, db: Session, kind: str, create_missing_authors: bool = False):
+        self.db = db
+        self.kind = kind
+        self.create_missing_authors = create_missing_authors
+        self.authors: Dict[str, int] = {}
+        self.use_copy = db.get_bind().dialect.driver == "psycopg2"
+
+    def resolve_authors(self, emails) -> Dict[str, int]:
+        missing = {email for email in emails if email not in self.authors}
+        if missing:
+            rows = self.db.execute(
+                select(models.User.email, models.User.id).where(models.User.email.in_(missing))
+            ).all()
+            self.authors.update({email: user_id for email, user_id in rows})
+            unknown = missing - self.authors.keys()
+            if unknown and self.create_missing_authors:
+                created = self.db.execute(
+                    insert(models.User).returning(models.User.email, models.User.id),
+                    [{"name": email.split("@")[0], "email": email} for email in sorted(unknown)],
+                ).all()
+                self.authors.update({email: user_id for email, user_id in created})
+        return self.authors
+
+    def validate(self, chunk: List[Tuple[int, dict]], report: ImportReport) -> List[dict]:
+        model = schemas.NewsCreate if self.kind == "news" else schemas.CommentCreate
+        valid = []
+        for line_num, record in chunk:
+            if "_error" in record:
+                report.reject(line_num, record["_error"])
+                continue
+            try:
+                item = model.model_validate(record)
+                published_at = _published_at(record)
+            except (ValidationError, ValueError) as e:
+                report.reject(line_num, str(e).replace("\n", " "))
+                continue
+            if not record.get("author_email"):
+                report.reject(line_num, "author_email is required")
+                continue
+            row = item.model_dump()
+            row.update(
+                published_at=published_at,
+                updated_at=datetime.utcnow(),
+                author_email=record["author_email"],
+                _line=line_num,
+            )
+            valid.append(row)
+
+        authors = self.resolve_authors({row["author_email"] for row in valid})
+        existing_news = set()
+        if self.kind == "comments":
+            news_ids = {row["news_id"] for row in valid}
+            existing_news = set(self.db.execute(
+                select(models.News.id).where(models.News.id.in_(news_ids))
+            ).scalars()) if news_ids else set()
+
+        rows = []
+        for row in valid:
+            author_id = authors.get(row.pop("author_email"))
+            line_num = row.pop("_line")
+            if author_id is None:
+                report.reject(line_num, "unknown author_email")
+            elif self.kind == "comments" and row["news_id"] not in existing_news:
+                report.reject(line_num, "news not found")
+            else:
+                row["author_id"] = author_id
+                rows.append(row)
+        return rows
+
+    def load(self, rows: List[dict]):
+        model = models.News if self.kind == "news" else models.Comment
+        columns = ["title", "content", "cover", "author_id", "published_at", "updated_at"] if self.kind == "news" \
+            else ["text", "news_id", "author_id", "published_at", "updated_at"]
+        if self.use_copy:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows:
+                writer.writerow([
+                    json.dumps(row[c]) if c == "content" else ("" if row[c] is None else row[c])
+                    for c in columns
+                ])
+            buffer.seek(0)
+            cursor = self.db.connection().connection.cursor()
+            cursor.copy_expert(copy_statement(model.__tablename__, columns, NOT_NULL_COLUMNS[self.kind]), buffer)
+        else:
+            self.db.execute(insert(model), [{c: row[c] for c in columns} for row in rows])
+
+        if self.kind == "news":
+            for author_id, count in Counter(row["author_id"] for row in rows).items():
+                counters.on_news_created(self.db, author_id, count)
+        else:
+            counters.on_comments_created(self.db, [(row["news_id"], row["author_id"]) for row in rows])
+
+    def run(self, records: Iterator[Tuple[int, dict]], chunk_size: int, report: ImportReport) -> ImportReport:
+        max_news_id = self.db.execute(select(func.max(models.News.id))).scalar() or 0
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
+            report.read += len(chunk)
+            rows = self.validate(chunk, report)
+            if rows:
+                self.load(rows)
+            self.db.commit()
+            report.imported += len(rows)
+            print(f"  {report.summary()}", file=sys.stderr)
+
+        if self.kind == "news":
+            # COPY does not return ids, index everything added after the start
+            search.rebuild_search_index(self.db, min_id=max_news_id)
+        return report
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Bulk import news or comments")
+    parser.add_argument("kind", choices=["news", "comments"])
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default=None,
+                        help="defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--create-missing-authors", action="store_true",
+                        help="create users for unknown author emails instead of rejecting the rows")
+    parser.add_argument("--show-rejected", type=int, default=20,
+                        help="number of rejected rows to print")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("csv" if args.path.endswith(".csv") else "ndjson")
+    db = SessionLocal()
+    try:
+        report = Importer(db, args.kind, args.create_missing_authors).run(
+            read_records(args.path, fmt), args.chunk_size, ImportReport()
+        )
+    finally:
+        db.close()
+
+    print(report.summary())
+    shown = report.rejected[:args.show_rejected]
+    for line_num, reason in shown:
+        print(f"  line {line_num}: {reason}")
+    if report.rejected_count > len(shown):
+        print(f"  ... and {report.rejected_count - len(shown)} more")
+
+if __name__ == "__main__":
+    main()
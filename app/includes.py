@@ -0,0 +1,76 @@
+"""
+Opt-in embedding of related rows on news reads: `?include=author,comments`.
+
+The number of SQL statements does not depend on the page size:
+
+- `author` is joined into the news query (many-to-one, one row per news);
+- `comments` are the latest `NEWS_EMBEDDED_COMMENTS` comments of every news
+  on the page, fetched with one window-function query and attached to the
+  already loaded news.
+
+Relationships that were not requested are loaded with `noload`, so
+serialization never falls back to a lazy load per row.
+"""
+from collections import defaultdict
+from typing import FrozenSet, Iterable, List, Optional, Sequence, Set
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload, noload
+from sqlalchemy.orm.attributes import set_committed_value
+from . import models, schemas
+from .serialization import dump_trusted, dump_trusted_one
+from .config import settings
+
+NEWS_INCLUDES = ("author", "comments")
+
+def parse_include(value: Optional[str]) -> FrozenSet[str]:
+    """Parse an `include=author,comments` query parameter."""
+    if not value:
+        return frozenset()
+    include = frozenset(part.strip() for part in value.split(",") if part.strip())
+    unknown = include.difference(NEWS_INCLUDES)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include: {', '.join(sorted(unknown))}; allowed: {', '.join(NEWS_INCLUDES)}"
+        )
+    return include
+
+def news_load_options(include: Iterable[str]) -> list:
+    """Loader options for a news query; comments are filled by attach_comments."""
+    return [
+        joinedload(models.News.author, innerjoin=True) if "author" in include else noload(models.News.author),
+        noload(models.News.comments),
+    ]
+
+def latest_comments_statement(news_ids: Sequence[int], limit: Optional[int] = None):
+    """Latest `limit` comments of each news in `news_ids`, in one statement."""
+    limit = settings.NEWS_EMBEDDED_COMMENTS if limit is None else limit
+    rank = func.row_number().over(
+        partition_by=models.Comment.news_id,
+        order_by=(models.Comment.published_at.desc(), models.Comment.id.desc()),
+    ).label("rank")
+    ranked = select(models.Comment.id, rank).where(models.Comment.news_id.in_(news_ids)).subquery()
+    return (
+        select(models.Comment)
+        .join(ranked, ranked.c.id == models.Comment.id)
+        .where(ranked.c.rank <= limit)
+        .order_by(models.Comment.published_at.desc(), models.Comment.id.desc())
+    )
+
+def attach_comments(news_items: Iterable[models.News], comments: Iterable[models.Comment]):
+    """Set `news.comments` to the given comments without marking the news dirty."""
+    by_news = defaultdict(list)
+    for comment in comments:
+        by_news[comment.news_id].append(comment)
+    for news in news_items:
+        set_committed_value(news, "comments", by_news.get(news.id, []))
+
+def _exclude(include: FrozenSet[str]) -> set:
+    return {name for name in NEWS_INCLUDES if name not in include}
+
+def dump_news(news: models.News, include: FrozenSet[str], exclude: Set[str] = frozenset()) -> bytes:
+    return dump_trusted_one(news, schemas.NewsExpanded, _exclude(include) | exclude)
+
+def dump_news_list(items: List[models.News], include: FrozenSet[str], exclude: Set[str] = frozenset()) -> bytes:
+    return dump_trusted(items, schemas.NewsExpanded, _exclude(include) | exclude)
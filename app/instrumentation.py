@@ -0,0 +1,101 @@
+"""
+Per-request telemetry: latency and status per route, and the number and
+duration of SQL statements each request issued.
+
+SQL statements are attributed to the current request through a context
+variable set by the middleware; sync endpoints run in a threadpool with a
+copy of the request context and async sessions run in the request task, so
+both paths are counted. Every response carries a `Server-Timing` header
+(`app` total, `db` SQL time and statement count) and the aggregates are served
+on /metrics in the Prometheus text format.
+"""
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from . import metrics
+
+REQUEST_DURATION = metrics.histogram(
+    "http_request_duration_seconds", "Request latency by route", ["method", "route"]
+)
+REQUESTS = metrics.counter(
+    "http_requests_total", "Requests by route and status code", ["method", "route", "status"]
+)
+REQUEST_SQL_STATEMENTS = metrics.histogram(
+    "http_request_sql_statements", "SQL statements issued per request", ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+REQUEST_SQL_DURATION = metrics.histogram(
+    "http_request_sql_duration_seconds", "Total SQL time per request", ["method", "route"]
+)
+
+class RequestStats:
+    __slots__ = ("sql_statements", "sql_seconds")
+
+    def __init__(self):
+        self.sql_statements = 0
+        self.sql_seconds = 0.0
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._telemetry_started = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    started = getattr(context, "_telemetry_started", None)
+    if stats is not None and started is not None:
+        stats.sql_statements += 1
+        stats.sql_seconds += time.perf_counter() - started
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: no per-request task or body buffering."""
+
+    def __init__(self, app):
+        self.app = app
+        self._routes: Optional[Dict] = None
+
+    def _route(self, scope) -> str:
+        # Label by path template, never by raw path, to keep cardinality bounded
+        if self._routes is None:
+            self._routes = {
+                getattr(route, "endpoint", None): getattr(route, "path", None)
+                for route in scope["app"].routes
+            }
+        return self._routes.get(scope.get("endpoint")) or "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                server_timing = (
+                    f'app;dur={elapsed_ms:.1f}, '
+                    f'db;dur={stats.sql_seconds * 1000:.1f};desc="{stats.sql_statements} queries"'
+                )
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", server_timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_stats.reset(token)
+            method, route = scope["method"], self._route(scope)
+            REQUEST_DURATION.labels(method, route).observe(time.perf_counter() - started)
+            REQUESTS.labels(method, route, str(status_code)).inc()
+            REQUEST_SQL_STATEMENTS.labels(method, route).observe(stats.sql_statements)
+            REQUEST_SQL_DURATION.labels(method, route).observe(stats.sql_seconds)
@@ -1,17 +1,47 @@
 # main.py
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.db import engine, Base
-from app.routers import users, news, comments, auth
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from app import auth as auth_utils, dependencies, metrics, search
+from app.instrumentation import MetricsMiddleware
+from app.page_cache import news_pages
+from app.repositories.caching_repo import repository_cache_stats
+from app.sweeper import token_sweeper
+from app.throttle import auth_throttle
+from app.config import settings
+from app.db import async_engine, engine, Base, check_database
+from app.routers import auth
+
+if settings.ASYNC_DB:
+    from app.routers import users_async as users, news_async as news, comments_async as comments
+else:
+    from app.routers import users, news, comments
 
 # Create tables
 Base.metadata.create_all(bind=engine)
+search.ensure_search_index(engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    token_sweeper.start()
+    yield
+    await token_sweeper.stop()
+    auth_utils.shutdown_hash_executor()
+    # aiosqlite keeps a worker thread per connection that blocks interpreter exit
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
 
 app = FastAPI(
     title="News API - lab2_Dawam_A_K",
     version="2.0.0",
-    description="API for news with authentication and authorization"
+    description="API for news with authentication and authorization",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/auth")
 app.include_router(users.router, prefix="/users")
@@ -24,4 +54,20 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "token_cache": dependencies.token_cache_stats(),
+        "news_page_cache": news_pages.stats(),
+        "repository_caches": repository_cache_stats(),
+        "token_sweeper": token_sweeper.stats(),
+        "auth_throttle": auth_throttle.stats(),
+    }
+
+@app.get("/health/db")
+def database_health_check():
+    report = check_database()
+    return JSONResponse(report, status_code=200 if report["status"] == "healthy" else 503)
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
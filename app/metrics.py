@@ -0,0 +1,129 @@
+"""
+Minimal in-process metrics: counters and fixed-bucket histograms that are
+cheap enough to update on every request or connection checkout, rendered in
+the Prometheus text exposition format by `render()`.
+"""
+import bisect
+import threading
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Seconds, from sub-millisecond to the default pool timeout
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Starlette appends "; charset=utf-8" to text/* media types itself
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # One slot per bucket plus +Inf
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> dict:
+        """Cumulative bucket counts keyed by upper bound, as Prometheus expects."""
+        with self._lock:
+            counts, total, count = list(self._counts), self._sum, self._count
+        buckets, cumulative = {}, 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+        return {"count": count, "sum": total, "buckets": buckets}
+
+class Counter:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+def histogram_lines(name: str, histogram: Histogram, labelnames: Sequence[str] = (), labelvalues: Sequence = ()) -> List[str]:
+    snapshot = histogram.snapshot()
+    lines = [
+        "{}_bucket{} {}".format(name, _labels(labelnames, labelvalues, 'le="%s"' % bound), count)
+        for bound, count in snapshot["buckets"].items()
+    ]
+    lines.append(f"{name}_sum{_labels(labelnames, labelvalues)} {_number(snapshot['sum'])}")
+    lines.append(f"{name}_count{_labels(labelnames, labelvalues)} {snapshot['count']}")
+    return lines
+
+class MetricFamily:
+    """A counter or histogram split by label values; children are created on first use."""
+
+    def __init__(self, name: str, documentation: str, kind: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self.buckets = buckets
+        self._children: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = Histogram(self.buckets) if self.kind == "histogram" else Counter()
+                    self._children[values] = child
+        return child
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            if self.kind == "histogram":
+                lines.extend(histogram_lines(self.name, child, self.labelnames, values))
+            else:
+                lines.append(f"{self.name}{_labels(self.labelnames, values)} {_number(child.value)}")
+        return lines
+
+_families: List[MetricFamily] = []
+_collectors: List[Callable[[], Iterable[str]]] = []
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> MetricFamily:
+    family = MetricFamily(name, documentation, "counter", labelnames)
+    _families.append(family)
+    return family
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> MetricFamily:
+    family = MetricFamily(name, documentation, "histogram", labelnames, buckets)
+    _families.append(family)
+    return family
+
+def register_collector(collector: Callable[[], Iterable[str]]):
+    """Add a callable producing ready-made exposition lines (gauges read on scrape)."""
+    _collectors.append(collector)
+
+def render() -> str:
+    lines: List[str] = []
+    for family in _families:
+        lines.extend(family.collect())
+    for collector in _collectors:
+        lines.extend(collector())
+    return "\n".join(lines) + "\n"
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, JSON, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, JSON, Text, Index
 from sqlalchemy.orm import relationship
 from .db import Base
 
@@ -14,25 +14,37 @@ class User(Base):
     is_admin = Column(Boolean, default=False)
     avatar = Column(String(512), nullable=True)
     github_id = Column(String(100), unique=True, nullable=True)
+    # Denormalized counters, maintained by app.counters
+    news_count = Column(Integer, default=0, server_default="0", nullable=False)
+    comment_count = Column(Integer, default=0, server_default="0", nullable=False)
     
     # Relationships
     news = relationship("News", back_populates="author", cascade="all, delete-orphan")
     comments = relationship("Comment", back_populates="author", cascade="all, delete-orphan")
     refresh_tokens = relationship("RefreshToken", back_populates="user", cascade="all, delete-orphan")
 
+    # Keyset pagination index
+    __table_args__ = (Index("ix_users_registered_at_id", "registered_at", "id"),)
+
 class News(Base):
     __tablename__ = "news"
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(300), nullable=False)
     content = Column(JSON, nullable=False)
     published_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     author_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     cover = Column(String(512), nullable=True)
+    # Denormalized counter, maintained by app.counters
+    comment_count = Column(Integer, default=0, server_default="0", nullable=False)
 
     # Relationships
     author = relationship("User", back_populates="news")
     comments = relationship("Comment", back_populates="news", cascade="all, delete-orphan")
 
+    # Keyset pagination index
+    __table_args__ = (Index("ix_news_published_at_id", "published_at", "id"),)
+
 class Comment(Base):
     __tablename__ = "comments"
     id = Column(Integer, primary_key=True, index=True)
@@ -40,19 +52,30 @@ class Comment(Base):
     news_id = Column(Integer, ForeignKey("news.id", ondelete="CASCADE"), nullable=False)
     author_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     published_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     # Relationships
     news = relationship("News", back_populates="comments")
     author = relationship("User", back_populates="comments")
 
+    # Keyset pagination index
+    __table_args__ = (Index("ix_comments_published_at_id", "published_at", "id"),)
+
 # Добавьте этот класс в конец файла
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
-    token = Column(String(512), unique=True, index=True)
+    # sha256 hex digest of the refresh JWT
+    token_hash = Column(String(64), unique=True, index=True, nullable=False)
     user_agent = Column(Text)
     created_at = Column(DateTime, default=datetime.utcnow)
     expires_at = Column(DateTime, nullable=False)
     
     user = relationship("User", back_populates="refresh_tokens")
+
+    # Active sessions of a user, and the range scan of app.sweeper
+    __table_args__ = (
+        Index("ix_refresh_tokens_user_id_expires_at", "user_id", "expires_at"),
+        Index("ix_refresh_tokens_expires_at", "expires_at"),
+    )
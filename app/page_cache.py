@@ -0,0 +1,135 @@
+"""
+Cache of serialized list pages (GET /news/), keyed by the query parameters.
+
+Each entry remembers which ids it contains so writes invalidate precisely:
+
+- an update (or a comment count change) drops the pages containing the id;
+- an insert drops the positional pages a new row can move into: offset
+  pages and the first cursor page (new rows are the newest);
+- a delete drops the pages containing the id plus the offset pages, whose
+  windows shift.
+
+Deeper cursor pages are anchored to their cursor and are unaffected by
+inserts and deletes elsewhere. A generation counter prevents a request that
+read the database before an invalidation from storing its stale page after it.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Hashable, Iterable, Optional, Set, Tuple
+from .config import settings
+
+@dataclass
+class CachedPage:
+    body: bytes
+    etag: str
+    ids: Tuple[int, ...]
+    headers: Dict[str, str] = field(default_factory=dict)
+    # True when inserts/deletes elsewhere can change the page
+    positional: bool = False
+    expires_at: float = 0.0
+
+class PageCache:
+    def __init__(self, maxsize: int = 256, ttl: float = 30.0, max_bytes: int = 32 * 1024 * 1024):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._pages: "OrderedDict[Hashable, CachedPage]" = OrderedDict()
+        self._by_id: Dict[int, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _remove(self, key: Hashable) -> Optional[CachedPage]:
+        page = self._pages.pop(key, None)
+        if page is None:
+            return None
+        self.bytes -= len(page.body)
+        for news_id in page.ids:
+            keys = self._by_id.get(news_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_id[news_id]
+        return page
+
+    def get(self, key: Hashable) -> Optional[CachedPage]:
+        with self._lock:
+            page = self._pages.get(key)
+            if page is None or page.expires_at <= time.monotonic():
+                if page is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._pages.move_to_end(key)
+            self.hits += 1
+            return page
+
+    def set(self, key: Hashable, page: CachedPage, generation: int):
+        """Store a page built from data read at `generation` (see `self.generation`)."""
+        if self.maxsize <= 0 or len(page.body) > self.max_bytes:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._remove(key)
+            page.expires_at = time.monotonic() + self.ttl
+            self._pages[key] = page
+            self.bytes += len(page.body)
+            for news_id in page.ids:
+                self._by_id.setdefault(news_id, set()).add(key)
+            while len(self._pages) > self.maxsize or self.bytes > self.max_bytes:
+                self._remove(next(iter(self._pages)))
+                self.evictions += 1
+
+    def _invalidate(self, keys: Iterable[Hashable]):
+        self.generation += 1
+        for key in list(keys):
+            if self._remove(key) is not None:
+                self.invalidations += 1
+
+    def _positional_keys(self):
+        return [key for key, page in self._pages.items() if page.positional]
+
+    def invalidate_ids(self, ids: Iterable[int]):
+        with self._lock:
+            self._invalidate({key for news_id in ids for key in self._by_id.get(news_id, ())})
+
+    def invalidate_inserts(self):
+        with self._lock:
+            self._invalidate(self._positional_keys())
+
+    def invalidate_deletes(self, ids: Iterable[int]):
+        with self._lock:
+            keys = {key for news_id in ids for key in self._by_id.get(news_id, ())}
+            keys.update(self._positional_keys())
+            self._invalidate(keys)
+
+    def clear(self):
+        with self._lock:
+            self._invalidate(list(self._pages))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._pages),
+            "maxsize": self.maxsize,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+news_pages = PageCache(
+    maxsize=settings.PAGE_CACHE_SIZE,
+    ttl=settings.PAGE_CACHE_TTL,
+    max_bytes=settings.PAGE_CACHE_MAX_BYTES,
+)
@@ -0,0 +1,72 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+from .config import settings
+
+def clamp_limit(limit: int) -> int:
+    """Apply the server-side page size cap."""
+    return max(1, min(limit, settings.MAX_PAGE_SIZE))
+
+def encode_cursor(sort_value: datetime, id: int) -> str:
+    raw = json.dumps([sort_value.isoformat(), id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(sort_value), int(id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def keyset_statement(query, sort_column, id_column, cursor: Optional[str], limit: int):
+    """
+    Restrict a Query or Select to one keyset page ordered by
+    (sort_column, id_column) descending. One extra row is requested so
+    `split_page` can tell whether a next page exists.
+    """
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor)
+        query = query.filter(tuple_(sort_column, id_column) < tuple_(sort_value, last_id))
+    return query.order_by(sort_column.desc(), id_column.desc()).limit(clamp_limit(limit) + 1)
+
+def split_page(items: List[Any], sort_column, id_column, limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Drop the look-ahead row and build the cursor of the next page."""
+    limit = clamp_limit(limit)
+    if len(items) <= limit:
+        return list(items), None
+    items = items[:limit]
+    last = items[-1]
+    return items, encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+
+def keyset_page(
+    query: Query,
+    sort_column,
+    id_column,
+    cursor: Optional[str],
+    limit: int,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Return one page ordered by (sort_column, id_column) descending plus the
+    cursor of the next page (None on the last page).
+
+    The page starts right after the row encoded in the cursor, so with an
+    index on (sort_column, id_column) every page costs the same regardless
+    of how deep it is. An empty cursor means the first page.
+    """
+    items = keyset_statement(query, sort_column, id_column, cursor, limit).all()
+    return split_page(items, sort_column, id_column, limit)
+
+def parse_ids(value: str) -> List[int]:
+    """Parse an `ids=1,2,3` query parameter, keeping order and dropping duplicates."""
+    try:
+        ids = list(dict.fromkeys(int(part) for part in value.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+    if len(ids) > settings.MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {settings.MAX_PAGE_SIZE} ids per request")
+    return ids
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, TypeVar, Generic
+from typing import List, Optional, Sequence, TypeVar, Generic
 from pydantic import BaseModel
 
 T = TypeVar('T')
@@ -16,6 +16,11 @@ class BaseRepository(ABC, Generic[T, C, U]):
     def get(self, id: int) -> Optional[T]:
         pass
     
+    @abstractmethod
+    def get_many(self, ids: Sequence[int]) -> List[T]:
+        """Objects for `ids` fetched in one query, in the order of `ids`; missing ids are skipped."""
+        pass
+    
     @abstractmethod
     def get_multi(self, skip: int = 0, limit: int = 100) -> List[T]:
         pass
@@ -27,3 +32,31 @@ class BaseRepository(ABC, Generic[T, C, U]):
     @abstractmethod
     def delete(self, id: int) -> bool:
         pass
+
+
+class AsyncBaseRepository(ABC, Generic[T, C, U]):
+    """The BaseRepository contract for repositories backed by async drivers."""
+
+    @abstractmethod
+    async def create(self, obj_in: C) -> T:
+        pass
+
+    @abstractmethod
+    async def get(self, id: int) -> Optional[T]:
+        pass
+
+    @abstractmethod
+    async def get_many(self, ids: Sequence[int]) -> List[T]:
+        pass
+
+    @abstractmethod
+    async def get_multi(self, skip: int = 0, limit: int = 100) -> List[T]:
+        pass
+
+    @abstractmethod
+    async def update(self, id: int, obj_in: U) -> Optional[T]:
+        pass
+
+    @abstractmethod
+    async def delete(self, id: int) -> bool:
+        pass
@@ -0,0 +1,116 @@
+from typing import Any, Dict, List, Optional, Sequence, Type
+from pydantic import BaseModel
+from app.cache import TTLCache
+from app.config import settings
+from app.repositories.base import BaseRepository
+
+# Caches shared by the short-lived repositories of one kind, by name
+_shared_caches: Dict[str, TTLCache] = {}
+
+def shared_cache(name: str) -> TTLCache:
+    """The process-wide cache registered as `name`, reported by /health."""
+    cache = _shared_caches.get(name)
+    if cache is None:
+        cache = _shared_caches.setdefault(
+            name, TTLCache(maxsize=settings.REPOSITORY_CACHE_SIZE, ttl=settings.REPOSITORY_CACHE_TTL)
+        )
+    return cache
+
+def repository_cache_stats() -> Dict[str, dict]:
+    return {name: cache.stats() for name, cache in sorted(_shared_caches.items())}
+
+class CachingRepository(BaseRepository):
+    """
+    Wraps any BaseRepository with a bounded in-process cache of `get` results
+    keyed by id. Writes made through the wrapper invalidate the affected entry.
+
+    Pass a shared `cache` (e.g. `shared_cache("users")`) to keep entries
+    between short-lived repository instances, such as one
+    SQLAlchemyRepository per request. A value loaded on a miss is stored
+    only if no write invalidated its id meanwhile. Cached entries
+    outlive the session that loaded them, so live ORM instances are never
+    stored: with `schema` every object is returned and cached as a
+    `schema.model_validate(obj)` snapshot; without it the repository must
+    return plain data (dicts or pydantic models, e.g. MongoDBRepository).
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        repository: BaseRepository,
+        maxsize: Optional[int] = None,
+        ttl: Optional[float] = None,
+        cache: Optional[TTLCache] = None,
+        schema: Optional[Type[BaseModel]] = None,
+    ):
+        self.repository = repository
+        self.schema = schema
+        if cache is None:
+            cache = TTLCache(
+                maxsize=settings.REPOSITORY_CACHE_SIZE if maxsize is None else maxsize,
+                ttl=settings.REPOSITORY_CACHE_TTL if ttl is None else ttl,
+            )
+        self.cache = cache
+
+    @staticmethod
+    def _id_of(obj: Any) -> Any:
+        if isinstance(obj, dict):
+            return obj.get("id")
+        return getattr(obj, "id", None)
+
+    def _snapshot(self, obj: Any) -> Any:
+        """A session-independent copy of a repository object."""
+        if obj is None:
+            return None
+        if self.schema is not None:
+            return self.schema.model_validate(obj)
+        if isinstance(obj, (dict, BaseModel)):
+            return obj
+        raise TypeError(f"Cannot cache {type(obj).__name__} objects without a schema")
+
+    def create(self, obj_in: Any) -> Any:
+        db_obj = self._snapshot(self.repository.create(obj_in))
+        # A stale entry may still exist if the id was used before
+        self.cache.pop(self._id_of(db_obj))
+        return db_obj
+
+    def get(self, id: int) -> Optional[Any]:
+        db_obj = self.cache.get(id)
+        if db_obj is None:
+            generation = self.cache.generation(id)
+            db_obj = self._snapshot(self.repository.get(id))
+            if db_obj is not None:
+                self.cache.set(id, db_obj, generation=generation)
+        return db_obj
+
+    def get_many(self, ids: Sequence[int]) -> List[Any]:
+        """Serve cached ids from memory and fetch the rest with one repository.get_many."""
+        found = {}
+        for id in ids:
+            db_obj = self.cache.get(id)
+            if db_obj is not None:
+                found[id] = db_obj
+        missing = [id for id in dict.fromkeys(ids) if id not in found]
+        if missing:
+            generations = {id: self.cache.generation(id) for id in missing}
+            for db_obj in map(self._snapshot, self.repository.get_many(missing)):
+                id = self._id_of(db_obj)
+                self.cache.set(id, db_obj, generation=generations.get(id))
+                found[id] = db_obj
+        return [found[id] for id in dict.fromkeys(ids) if id in found]
+
+    def get_multi(self, skip: int = 0, limit: int = 100) -> List[Any]:
+        return [self._snapshot(db_obj) for db_obj in self.repository.get_multi(skip=skip, limit=limit)]
+
+    def update(self, id: int, obj_in: Any) -> Optional[Any]:
+        db_obj = self._snapshot(self.repository.update(id, obj_in))
+        self.cache.pop(id)
+        return db_obj
+
+    def delete(self, id: int) -> bool:
+        deleted = self.repository.delete(id)
+        self.cache.pop(id)
+        return deleted
+
+    def stats(self) -> dict:
+        return self.cache.stats()
@@ -0,0 +1,156 @@
+from typing import AsyncIterator, Iterable, List, Optional, Sequence, Tuple, Any, Dict
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from pymongo import ASCENDING, DESCENDING, ReturnDocument, UpdateOne
+from app.config import settings
+from app.repositories.base import AsyncBaseRepository
+from app.repositories.mongodb_repo import (
+    BACKFILL_BATCH_SIZE, COUNTERS_COLLECTION, NO_OBJECT_ID, backfill_operations, projection_for
+)
+
+# Motor counterpart of mongodb_repo: same documents, ids, indexes and
+# results, without blocking the event loop. The client binds to the event
+# loop that first uses it, so create repositories from async code.
+_client: Optional[AsyncIOMotorClient] = None
+_indexed_collections = set()
+
+def get_async_mongo_client() -> AsyncIOMotorClient:
+    global _client
+    if _client is None:
+        _client = AsyncIOMotorClient(
+            settings.MONGODB_URL,
+            maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+            minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+            waitQueueTimeoutMS=settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+            serverSelectionTimeoutMS=settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        )
+    return _client
+
+def close_async_mongo_client():
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+        _indexed_collections.clear()
+
+async def ensure_indexes(collection: AsyncIOMotorCollection):
+    """See mongodb_repo.ensure_indexes, including the backfill of missing ids."""
+    key = (collection.database.name, collection.name)
+    if key in _indexed_collections:
+        return
+    counters = collection.database[COUNTERS_COLLECTION]
+    # Start the id sequence after documents that already exist
+    last = await collection.find_one({}, {"id": 1, "_id": 0}, sort=[("id", DESCENDING)])
+    await counters.update_one({"_id": collection.name}, {"$max": {"seq": (last or {}).get("id") or 0}}, upsert=True)
+    while True:
+        cursor = collection.find({"id": None}, {"_id": 1}, sort=[("_id", ASCENDING)], limit=BACKFILL_BATCH_SIZE)
+        legacy = [doc["_id"] async for doc in cursor]
+        if not legacy:
+            break
+        counter = await counters.find_one_and_update(
+            {"_id": collection.name}, {"$inc": {"seq": len(legacy)}}, return_document=ReturnDocument.AFTER
+        )
+        await collection.bulk_write(backfill_operations(legacy, counter["seq"] - len(legacy) + 1), ordered=False)
+    await collection.create_index([("id", ASCENDING)], unique=True, name="id_unique")
+    await collection.create_index([("published_at", DESCENDING), ("id", DESCENDING)], name="published_at_id")
+    _indexed_collections.add(key)
+
+class AsyncMongoDBRepository(AsyncBaseRepository):
+    def __init__(self, collection_name: str, client: Optional[AsyncIOMotorClient] = None):
+        self.client = client or get_async_mongo_client()
+        self.db = self.client[settings.MONGODB_DB]
+        self.collection = self.db[collection_name]
+
+    async def _collection(self) -> AsyncIOMotorCollection:
+        # Index bootstrap needs a round trip, so it runs on first use instead of in __init__
+        await ensure_indexes(self.collection)
+        return self.collection
+
+    async def _allocate_ids(self, count: int) -> range:
+        counter = await self.db[COUNTERS_COLLECTION].find_one_and_update(
+            {"_id": self.collection.name},
+            {"$inc": {"seq": count}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        last = counter["seq"]
+        return range(last - count + 1, last + 1)
+
+    async def create(self, obj_in: Any) -> Dict:
+        collection = await self._collection()
+        obj_dict = obj_in.model_dump()
+        obj_dict["id"] = (await self._allocate_ids(1))[0]
+        await collection.insert_one(obj_dict)
+        obj_dict.pop("_id", None)
+        return obj_dict
+
+    async def bulk_create(self, objs_in: Iterable[Any]) -> List[Dict]:
+        collection = await self._collection()
+        docs = [obj_in.model_dump() for obj_in in objs_in]
+        if not docs:
+            return []
+        for doc, doc_id in zip(docs, await self._allocate_ids(len(docs))):
+            doc["id"] = doc_id
+        await collection.insert_many(docs, ordered=False)
+        for doc in docs:
+            doc.pop("_id", None)
+        return docs
+
+    async def get(self, id: int) -> Optional[Dict]:
+        collection = await self._collection()
+        return await collection.find_one({"id": id}, NO_OBJECT_ID)
+
+    async def get_many(self, ids: Sequence[int]) -> List[Dict]:
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return []
+        collection = await self._collection()
+        by_id = {doc["id"]: doc async for doc in collection.find({"id": {"$in": ids}}, NO_OBJECT_ID)}
+        return [by_id[id] for id in ids if id in by_id]
+
+    async def get_multi(self, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None) -> List[Dict]:
+        collection = await self._collection()
+        cursor = collection.find({}, projection_for(fields)).sort("id", ASCENDING).skip(skip).limit(limit)
+        return await cursor.to_list(length=limit or None)
+
+    async def iter_multi(
+        self,
+        skip: int = 0,
+        limit: int = 0,
+        fields: Optional[Sequence[str]] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Dict]:
+        """Stream documents in id order, `batch_size` per round trip; limit 0 means all."""
+        collection = await self._collection()
+        cursor = collection.find({}, projection_for(fields)).sort("id", ASCENDING).skip(skip).limit(limit)
+        async for doc in cursor.batch_size(batch_size):
+            yield doc
+
+    async def update(self, id: int, obj_in: Any) -> Optional[Dict]:
+        collection = await self._collection()
+        update_data = obj_in.model_dump(exclude_unset=True)
+        update_data.pop("id", None)
+        if not update_data:
+            return await self.get(id)
+        return await collection.find_one_and_update(
+            {"id": id},
+            {"$set": update_data},
+            projection=NO_OBJECT_ID,
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def bulk_update(self, updates: Iterable[Tuple[int, Any]]) -> int:
+        collection = await self._collection()
+        operations = []
+        for doc_id, obj_in in updates:
+            update_data = obj_in.model_dump(exclude_unset=True)
+            update_data.pop("id", None)
+            if update_data:
+                operations.append(UpdateOne({"id": doc_id}, {"$set": update_data}))
+        if not operations:
+            return 0
+        return (await collection.bulk_write(operations, ordered=False)).matched_count
+
+    async def delete(self, id: int) -> bool:
+        collection = await self._collection()
+        result = await collection.delete_one({"id": id})
+        return result.deleted_count > 0
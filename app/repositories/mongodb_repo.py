@@ -1,33 +1,163 @@
-from typing import List, Optional, Type, Any, Dict
-from pymongo import MongoClient
+import threading
+from typing import Iterable, List, Optional, Sequence, Tuple, Any, Dict
+from pymongo import ASCENDING, DESCENDING, MongoClient, ReturnDocument, UpdateOne
+from pymongo.collection import Collection
+from app.config import settings
 from app.repositories.base import BaseRepository
-import os
+
+# One client per process: MongoClient is thread-safe and owns the connection
+# pool, so repositories share it instead of opening their own
+_client: Optional[MongoClient] = None
+_client_lock = threading.Lock()
+_indexed_collections = set()
+
+# Documents are addressed by an integer `id`; the Mongo ObjectId stays internal
+NO_OBJECT_ID = {"_id": 0}
+COUNTERS_COLLECTION = "counters"
+# Documents written before `id` existed are numbered in batches of this size
+BACKFILL_BATCH_SIZE = 1000
+
+def get_mongo_client() -> MongoClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = MongoClient(
+                    settings.MONGODB_URL,
+                    maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+                    minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+                    waitQueueTimeoutMS=settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+                    serverSelectionTimeoutMS=settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+                )
+    return _client
+
+def close_mongo_client():
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+            _indexed_collections.clear()
+
+def backfill_operations(object_ids: Sequence[Any], first_id: int) -> List[UpdateOne]:
+    """Number documents that have no `id` yet, skipping any numbered meanwhile."""
+    return [
+        UpdateOne({"_id": object_id, "id": None}, {"$set": {"id": first_id + offset}})
+        for offset, object_id in enumerate(object_ids)
+    ]
+
+def ensure_indexes(collection: Collection):
+    """
+    Create the indexes the repository queries rely on, once per collection and process.
+
+    Documents stored before documents had an integer `id` (no `id` field)
+    are first given ids from the sequence, otherwise their missing ids would
+    collide in the unique index.
+    """
+    key = (collection.database.name, collection.name)
+    if key in _indexed_collections:
+        return
+    counters = collection.database[COUNTERS_COLLECTION]
+    # Start the id sequence after documents that already exist
+    last = collection.find_one({}, {"id": 1, "_id": 0}, sort=[("id", DESCENDING)])
+    counters.update_one({"_id": collection.name}, {"$max": {"seq": (last or {}).get("id") or 0}}, upsert=True)
+    while True:
+        legacy = [doc["_id"] for doc in collection.find(
+            {"id": None}, {"_id": 1}, sort=[("_id", ASCENDING)], limit=BACKFILL_BATCH_SIZE
+        )]
+        if not legacy:
+            break
+        counter = counters.find_one_and_update(
+            {"_id": collection.name}, {"$inc": {"seq": len(legacy)}}, return_document=ReturnDocument.AFTER
+        )
+        collection.bulk_write(backfill_operations(legacy, counter["seq"] - len(legacy) + 1), ordered=False)
+    collection.create_index([("id", ASCENDING)], unique=True, name="id_unique")
+    collection.create_index([("published_at", DESCENDING), ("id", DESCENDING)], name="published_at_id")
+    _indexed_collections.add(key)
+
+def projection_for(fields: Optional[Sequence[str]]) -> Dict[str, int]:
+    if not fields:
+        return NO_OBJECT_ID
+    projection = {field: 1 for field in fields}
+    projection.update({"id": 1, "_id": 0})
+    return projection
 
 class MongoDBRepository(BaseRepository):
-    def __init__(self, collection_name: str):
-        self.client = MongoClient(os.getenv("MONGODB_URL", "mongodb://localhost:27017/"))
-        self.db = self.client.news_db
+    def __init__(self, collection_name: str, client: Optional[MongoClient] = None):
+        self.client = client or get_mongo_client()
+        self.db = self.client[settings.MONGODB_DB]
         self.collection = self.db[collection_name]
-    
+        ensure_indexes(self.collection)
+
+    def _allocate_ids(self, count: int) -> range:
+        # Atomic sequence per collection, as with SQL SERIAL columns
+        counter = self.db[COUNTERS_COLLECTION].find_one_and_update(
+            {"_id": self.collection.name},
+            {"$inc": {"seq": count}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        last = counter["seq"]
+        return range(last - count + 1, last + 1)
+
     def create(self, obj_in: Any) -> Dict:
-        obj_dict = obj_in.dict()
-        result = self.collection.insert_one(obj_dict)
-        obj_dict["id"] = str(result.inserted_id)
+        obj_dict = obj_in.model_dump()
+        obj_dict["id"] = self._allocate_ids(1)[0]
+        self.collection.insert_one(obj_dict)
+        obj_dict.pop("_id", None)
         return obj_dict
-    
+
+    def bulk_create(self, objs_in: Iterable[Any]) -> List[Dict]:
+        """Insert many documents with one id allocation and one insert_many."""
+        docs = [obj_in.model_dump() for obj_in in objs_in]
+        if not docs:
+            return []
+        for doc, doc_id in zip(docs, self._allocate_ids(len(docs))):
+            doc["id"] = doc_id
+        self.collection.insert_many(docs, ordered=False)
+        for doc in docs:
+            doc.pop("_id", None)
+        return docs
+
     def get(self, id: int) -> Optional[Dict]:
-        return self.collection.find_one({"id": id})
-    
-    def get_multi(self, skip: int = 0, limit: int = 100) -> List[Dict]:
-        return list(self.collection.find().skip(skip).limit(limit))
-    
+        return self.collection.find_one({"id": id}, NO_OBJECT_ID)
+
+    def get_many(self, ids: Sequence[int]) -> List[Dict]:
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return []
+        by_id = {doc["id"]: doc for doc in self.collection.find({"id": {"$in": ids}}, NO_OBJECT_ID)}
+        return [by_id[id] for id in ids if id in by_id]
+
+    def get_multi(self, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None) -> List[Dict]:
+        """Documents ordered by id; `fields` limits what the server sends back (`id` is always included)."""
+        cursor = self.collection.find({}, projection_for(fields)).sort("id", ASCENDING).skip(skip).limit(limit)
+        return list(cursor)
+
     def update(self, id: int, obj_in: Any) -> Optional[Dict]:
-        update_data = obj_in.dict(exclude_unset=True)
-        result = self.collection.update_one({"id": id}, {"$set": update_data})
-        if result.modified_count:
+        update_data = obj_in.model_dump(exclude_unset=True)
+        update_data.pop("id", None)
+        if not update_data:
             return self.get(id)
-        return None
-    
+        return self.collection.find_one_and_update(
+            {"id": id},
+            {"$set": update_data},
+            projection=NO_OBJECT_ID,
+            return_document=ReturnDocument.AFTER,
+        )
+
+    def bulk_update(self, updates: Iterable[Tuple[int, Any]]) -> int:
+        """Apply (id, partial update) pairs with one unordered bulk_write. Returns the number matched."""
+        operations = []
+        for doc_id, obj_in in updates:
+            update_data = obj_in.model_dump(exclude_unset=True)
+            update_data.pop("id", None)
+            if update_data:
+                operations.append(UpdateOne({"id": doc_id}, {"$set": update_data}))
+        if not operations:
+            return 0
+        return self.collection.bulk_write(operations, ordered=False).matched_count
+
     def delete(self, id: int) -> bool:
         result = self.collection.delete_one({"id": id})
         return result.deleted_count > 0
@@ -1,4 +1,4 @@
-from typing import List, Optional, Type, Any
+from typing import List, Optional, Sequence, Type, Any
 from sqlalchemy.orm import Session
 from app.repositories.base import BaseRepository
 from app.models import Base
@@ -18,6 +18,13 @@ class SQLAlchemyRepository(BaseRepository):
     def get(self, id: int) -> Optional[Base]:
         return self.db.query(self.model).filter(self.model.id == id).first()
     
+    def get_many(self, ids: Sequence[int]) -> List[Base]:
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return []
+        by_id = {obj.id: obj for obj in self.db.query(self.model).filter(self.model.id.in_(ids))}
+        return [by_id[id] for id in ids if id in by_id]
+    
     def get_multi(self, skip: int = 0, limit: int = 100) -> List[Base]:
         return self.db.query(self.model).offset(skip).limit(limit).all()
     
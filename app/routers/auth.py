@@ -1,9 +1,10 @@
-from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordRequestForm
+from starlette.concurrency import run_in_threadpool
 from fastapi_sso.sso.github import GithubSSO
 from sqlalchemy.orm import Session
 from app import schemas, crud, dependencies, models
+from app.throttle import auth_throttle
 from app.db import get_db
 from app.config import settings
 
@@ -18,22 +19,23 @@ github_sso = GithubSSO(
 )
 
 @router.post("/register", response_model=schemas.Token)
-def register(
+async def register(
     user_in: schemas.UserCreate,
     request: Request,
     db: Session = Depends(get_db)
 ):
     """Register a new user with email and password"""
+    auth_throttle.check(request, user_in.email)
     try:
         # Check if user already exists
-        if crud.get_user_by_email(db, user_in.email):
+        if await run_in_threadpool(crud.get_user_by_email, db, user_in.email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
         
         # Create user
-        user = crud.create_user_with_password(db, user_in)
+        user = await crud.create_user_with_password(db, user_in)
         
         # Create tokens
         access_token = dependencies.create_access_token(data={"user_id": user.id})
@@ -41,13 +43,15 @@ def register(
         
         # Store refresh token
         user_agent = request.headers.get("user-agent", "")
-        crud.create_refresh_token(db, user.id, refresh_token, user_agent)
+        await run_in_threadpool(crud.create_refresh_token, db, user.id, refresh_token, user_agent)
         
         return {
             "access_token": access_token,
             "refresh_token": refresh_token,
             "token_type": "bearer"
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -55,14 +59,15 @@ def register(
         )
 
 @router.post("/login", response_model=schemas.Token)
-def login(
+async def login(
     user_in: schemas.UserLogin,
     request: Request,
     db: Session = Depends(get_db)
 ):
     """Login with email and password"""
+    auth_throttle.check(request, user_in.email)
     try:
-        user = crud.authenticate_user(db, user_in.email, user_in.password)
+        user = await crud.authenticate_user(db, user_in.email, user_in.password)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -75,13 +80,15 @@ def login(
         
         # Store refresh token
         user_agent = request.headers.get("user-agent", "")
-        crud.create_refresh_token(db, user.id, refresh_token, user_agent)
+        await run_in_threadpool(crud.create_refresh_token, db, user.id, refresh_token, user_agent)
         
         return {
             "access_token": access_token,
             "refresh_token": refresh_token,
             "token_type": "bearer"
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -110,21 +117,17 @@ def refresh_token(
                 detail="Invalid refresh token"
             )
         
-        # Verify refresh token exists in database
-        refresh_token_obj = crud.get_refresh_token(db, refresh_request.refresh_token)
-        if not refresh_token_obj or refresh_token_obj.expires_at < datetime.utcnow():
+        # Swap the stored token in one conditional UPDATE; fails when the token
+        # is unknown, expired or was already rotated by a concurrent request
+        new_refresh_token = dependencies.create_refresh_token(data={"user_id": user_id})
+        user_agent = request.headers.get("user-agent", "")
+        if not crud.rotate_refresh_token(db, user_id, refresh_request.refresh_token, new_refresh_token, user_agent):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Refresh token expired or invalid"
             )
         
-        # Create new tokens
         access_token = dependencies.create_access_token(data={"user_id": user_id})
-        new_refresh_token = dependencies.create_refresh_token(data={"user_id": user_id})
-        
-        # Update refresh token in database
-        user_agent = request.headers.get("user-agent", "")
-        crud.update_refresh_token(db, refresh_request.refresh_token, new_refresh_token, user_agent)
         
         return {
             "access_token": access_token,
@@ -143,11 +146,13 @@ def refresh_token(
 def logout(
     refresh_request: schemas.RefreshTokenRequest,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(dependencies.get_current_user)
+    current_user: models.User = Depends(dependencies.get_current_user),
+    access_token: str = Depends(dependencies.oauth2_scheme)
 ):
     """Logout by invalidating refresh token"""
     try:
         crud.delete_refresh_token(db, refresh_request.refresh_token)
+        dependencies.evict_token(access_token)
         return {"message": "Successfully logged out"}
     except Exception as e:
         raise HTTPException(
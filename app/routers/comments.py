@@ -1,7 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import Any, List, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from .. import schemas, crud, dependencies, models
+from .. import conditional, export, schemas, crud, dependencies, models
+from ..config import settings
 from ..db import get_db
+from ..serialization import trusted_response
 
 router = APIRouter(prefix="/comments", tags=["comments"])
 
@@ -13,24 +18,86 @@ def create_comment(
 ):
     return crud.create_comment(db, comment_in, current_user.id)
 
+@router.post("/batch", response_model=schemas.BatchCreateResult)
+def create_comments_batch(
+    items: List[Any] = Body(...),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(dependencies.get_current_user)
+):
+    """
+    Create many comments in one transaction. Invalid items and items
+    referencing missing news are reported in `errors` by their index.
+    """
+    if len(items) > settings.MAX_BATCH_SIZE:
+        raise HTTPException(400, f"Batch is limited to {settings.MAX_BATCH_SIZE} items")
+    valid, errors = schemas.validate_batch(schemas.CommentCreate, items)
+
+    existing_news = crud.get_existing_news_ids(db, [comment_in.news_id for _, comment_in in valid])
+    to_create = []
+    for index, comment_in in valid:
+        if comment_in.news_id in existing_news:
+            to_create.append(comment_in)
+        else:
+            errors.append(schemas.BatchItemError(index=index, detail="News not found"))
+    errors.sort(key=lambda error: error.index)
+
+    created_ids = crud.create_comments_batch(db, to_create, current_user.id)
+    return {"created_ids": created_ids, "errors": errors}
+
 @router.get("/", response_model=list[schemas.CommentRead])
 def read_comments(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(dependencies.get_current_user)
 ):
-    return crud.get_comments(db, skip=skip, limit=limit)
+    """
+    List comments. Passing `cursor` (empty for the first page) switches to
+    keyset pagination, newest first; the next page cursor is sent in `X-Next-Cursor`.
+    Responds 304 when `If-None-Match` matches the page ETag.
+    """
+    headers = {}
+    if cursor is not None:
+        items, next_cursor = crud.get_comments_page(db, cursor=cursor, limit=limit)
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+    else:
+        items = crud.get_comments(db, skip=skip, limit=limit)
+
+    etag = conditional.make_etag(crud.comment_validators(comment) for comment in items)
+    if conditional.is_not_modified(request, etag):
+        return conditional.not_modified(etag, headers=headers)
+    return trusted_response(items, schemas.CommentRead, headers={"ETag": etag, **headers})
+
+@router.get("/export")
+def export_comments(
+    published_from: Optional[datetime] = None,
+    published_to: Optional[datetime] = None,
+    current_user: models.User = Depends(dependencies.get_current_user)
+):
+    """Stream comments as NDJSON, optionally limited to a [published_from, published_to) range."""
+    return StreamingResponse(
+        export.iter_comments_ndjson(published_from, published_to),
+        media_type="application/x-ndjson"
+    )
 
 @router.get("/{comment_id}", response_model=schemas.CommentRead)
 def read_comment(
     comment_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(dependencies.get_current_user)
 ):
     comment = crud.get_comment_by_id(db, comment_id)
     if not comment:
         raise HTTPException(404, "Comment not found")
+    etag = conditional.make_etag([crud.comment_validators(comment)])
+    if conditional.is_not_modified(request, etag, comment.updated_at):
+        return conditional.not_modified(etag, comment.updated_at)
+    conditional.set_validators(response, etag, comment.updated_at)
     return comment
 
 @router.put("/{comment_id}", response_model=schemas.CommentRead)
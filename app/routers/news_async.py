@@ -0,0 +1,211 @@
+from datetime import datetime
+from typing import Any, List, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from .. import conditional, export, fieldsets, includes, schemas, crud_async, dependencies, models
+from ..config import settings
+from ..dataloader import AsyncLoaders
+from ..db import get_async_db
+from ..page_cache import CachedPage, news_pages
+from ..pagination import parse_ids
+from ..serialization import dump_trusted, dump_trusted_one, trusted_response
+
+router = APIRouter(prefix="/news", tags=["news"])
+
+@router.post("/", response_model=schemas.NewsRead)
+async def create_news(
+    news_in: schemas.NewsCreate,
+    db: AsyncSession = Depends(get_async_db),
+    verified_author: models.User = Depends(dependencies.require_verified_author_async)
+):
+    return await crud_async.create_news(db, news_in, verified_author.id)
+
+@router.post("/batch", response_model=schemas.BatchCreateResult)
+async def create_news_batch(
+    items: List[Any] = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+    verified_author: models.User = Depends(dependencies.require_verified_author_async)
+):
+    """
+    Create many news in one transaction. Invalid items are reported in
+    `errors` by their index and the rest are created.
+    """
+    if len(items) > settings.MAX_BATCH_SIZE:
+        raise HTTPException(400, f"Batch is limited to {settings.MAX_BATCH_SIZE} items")
+    valid, errors = schemas.validate_batch(schemas.NewsCreate, items)
+    created_ids = await crud_async.create_news_batch(db, [news_in for _, news_in in valid], verified_author.id)
+    return {"created_ids": created_ids, "errors": errors}
+
+@router.get("/", response_model=list[schemas.NewsRead])
+async def read_news(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    ids: Optional[str] = None,
+    include: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    loaders: AsyncLoaders = Depends(dependencies.get_loaders_async),
+    current_user: models.User = Depends(dependencies.get_current_user_async)
+):
+    """
+    List news. Passing `cursor` (empty for the first page) switches to keyset
+    pagination, newest first; the next page cursor is sent in `X-Next-Cursor`.
+    `ids=3,1,2` returns exactly those news, in that order, with one query.
+    `include=author,comments` embeds the author and the latest comments of
+    every news (see app.includes).
+    `fields=id,title` or `fields=summary` selects and returns only those
+    columns (see app.fieldsets); `summary` never reads `content`.
+    Responds 304 when `If-None-Match` matches the page ETag. Serialized pages
+    are cached until a write touches them (see app.page_cache).
+    """
+    embed = includes.parse_include(include)
+    columns = fieldsets.NEWS.parse(fields)
+    exclude = fieldsets.NEWS.exclude(columns)
+    if embed:
+        # Embedded authors and comments are not covered by the page ETag or
+        # the page cache invalidation, so these pages are always built fresh
+        headers = {}
+        if ids is not None:
+            items = await crud_async.get_news_by_ids(db, parse_ids(ids), include=embed, fields=columns)
+        elif cursor is not None:
+            items, next_cursor = await crud_async.get_news_page(db, cursor=cursor, limit=limit, include=embed, fields=columns)
+            if next_cursor:
+                headers["X-Next-Cursor"] = next_cursor
+        else:
+            items = await crud_async.get_news(db, skip=skip, limit=limit, include=embed, fields=columns)
+        body = includes.dump_news_list(items, embed, exclude)
+        return Response(body, media_type="application/json", headers=headers)
+
+    if ids is not None:
+        if columns:
+            items = await crud_async.get_news_by_ids(db, parse_ids(ids), fields=columns)
+        else:
+            items = await loaders.news.load_many(parse_ids(ids))
+        etag = conditional.make_etag(
+            ((news.id, news.published_at, news.updated_at, news.comment_count) for news in items), columns
+        )
+        if conditional.is_not_modified(request, etag):
+            return conditional.not_modified(etag)
+        return trusted_response(items, schemas.NewsRead, headers={"ETag": etag}, exclude=exclude)
+
+    key = ("cursor", cursor, limit, columns) if cursor is not None else ("offset", skip, limit, columns)
+    page = news_pages.get(key)
+    if page is None:
+        generation = news_pages.generation
+        headers = {}
+        if cursor is not None:
+            rows, next_cursor = await crud_async.get_news_validators_page(db, cursor=cursor, limit=limit)
+            if next_cursor:
+                headers["X-Next-Cursor"] = next_cursor
+        else:
+            rows = await crud_async.get_news_validators_list(db, skip=skip, limit=limit)
+
+        etag = conditional.make_etag(rows, columns)
+        if conditional.is_not_modified(request, etag):
+            return conditional.not_modified(etag, headers=headers)
+
+        items = await crud_async.get_news_by_ids(db, [row.id for row in rows], fields=columns)
+        page = CachedPage(
+            body=dump_trusted(items, schemas.NewsRead, exclude),
+            etag=etag,
+            ids=tuple(row.id for row in rows),
+            headers=headers,
+            # Offset pages and the first cursor page move when rows are added
+            positional=not cursor,
+        )
+        news_pages.set(key, page, generation)
+    elif conditional.is_not_modified(request, page.etag):
+        return conditional.not_modified(page.etag, headers=page.headers)
+
+    return Response(page.body, media_type="application/json", headers={"ETag": page.etag, **page.headers})
+
+@router.get("/search", response_model=list[schemas.NewsRead])
+async def search_news(
+    q: str = Query(..., min_length=1),
+    skip: int = 0,
+    limit: int = 20,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(dependencies.get_current_user_async)
+):
+    """Full-text search over news titles and content, best match first."""
+    return trusted_response(await crud_async.search_news(db, q, skip=skip, limit=limit), schemas.NewsRead)
+
+@router.get("/export")
+async def export_news(
+    published_from: Optional[datetime] = None,
+    published_to: Optional[datetime] = None,
+    current_user: models.User = Depends(dependencies.get_current_user_async)
+):
+    """Stream news as NDJSON, optionally limited to a [published_from, published_to) range."""
+    return StreamingResponse(
+        export.iter_news_ndjson(published_from, published_to),
+        media_type="application/x-ndjson"
+    )
+
+@router.get("/{news_id}", response_model=schemas.NewsRead)
+async def read_news_item(
+    news_id: int,
+    request: Request,
+    response: Response,
+    include: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(dependencies.get_current_user_async)
+):
+    """
+    `include=author,comments` embeds the author and the latest comments;
+    `fields=id,title` or `fields=summary` returns only those columns.
+    """
+    embed = includes.parse_include(include)
+    columns = fieldsets.NEWS.parse(fields)
+    if embed:
+        news = await crud_async.get_news_by_id(db, news_id, include=embed, fields=columns)
+        if not news:
+            raise HTTPException(404, "News not found")
+        body = includes.dump_news(news, embed, fieldsets.NEWS.exclude(columns))
+        return Response(body, media_type="application/json")
+
+    validators = await crud_async.get_news_validators(db, news_id)
+    if not validators:
+        raise HTTPException(404, "News not found")
+    etag = conditional.make_etag([validators], columns)
+    if conditional.is_not_modified(request, etag, validators.updated_at):
+        return conditional.not_modified(etag, validators.updated_at)
+
+    news = await crud_async.get_news_by_id(db, news_id, fields=columns)
+    if not news:
+        raise HTTPException(404, "News not found")
+    if columns:
+        response = Response(
+            dump_trusted_one(news, schemas.NewsRead, fieldsets.NEWS.exclude(columns)), media_type="application/json"
+        )
+        conditional.set_validators(response, etag, validators.updated_at)
+        return response
+    conditional.set_validators(response, etag, validators.updated_at)
+    return news
+
+@router.put("/{news_id}", response_model=schemas.NewsRead)
+async def update_news(
+    news_id: int,
+    news_update: schemas.NewsCreate,
+    db: AsyncSession = Depends(get_async_db),
+    news: models.News = Depends(dependencies.check_news_ownership_async)
+):
+    updated_news = await crud_async.update_news(db, news_id, news_update)
+    if not updated_news:
+        raise HTTPException(404, "News not found")
+    return updated_news
+
+@router.delete("/{news_id}")
+async def delete_news(
+    news_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    news: models.News = Depends(dependencies.check_news_ownership_async)
+):
+    success = await crud_async.delete_news(db, news_id)
+    if not success:
+        raise HTTPException(404, "News not found")
+    return {"message": "News deleted successfully"}
@@ -1,14 +1,16 @@
 # routers/users.py
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from app import schemas, dependencies, crud, models
+from starlette.concurrency import run_in_threadpool
+from app import schemas, dependencies, crud, fieldsets, models
 from app.db import get_db
+from app.serialization import dump_trusted_one, trusted_response
 
 router = APIRouter(tags=["users"])
 
 @router.post("/", response_model=schemas.UserRead, status_code=status.HTTP_201_CREATED)
-def create_user(
+async def create_user(
     user_in: schemas.UserCreate,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(dependencies.get_current_user)
@@ -23,22 +25,26 @@ def create_user(
             detail="Not enough permissions"
         )
         
-    existing = crud.get_user_by_email(db, user_in.email)
+    existing = await run_in_threadpool(crud.get_user_by_email, db, user_in.email)
     if existing:
         raise HTTPException(400, "Email already registered")
         
-    user = crud.create_user_with_password(db, user_in)
+    user = await crud.create_user_with_password(db, user_in)
     return user
 
 @router.get("/", response_model=List[schemas.UserRead])
 def get_users(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(dependencies.get_current_user)
 ):
     """
-    Get list of users (pagination via skip/limit).
+    Get list of users (pagination via skip/limit, or via `cursor` - pass an
+    empty cursor for the first page and follow the `X-Next-Cursor` header).
+    `fields=id,name` or `fields=summary` returns only those columns.
     """
     # Only admins can list all users
     if not current_user.is_admin:
@@ -46,7 +52,13 @@ def get_users(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
-    return crud.get_users(db, skip=skip, limit=limit)
+    columns = fieldsets.USERS.parse(fields)
+    exclude = fieldsets.USERS.exclude(columns)
+    if cursor is not None:
+        users, next_cursor = crud.get_users_page(db, cursor=cursor, limit=limit, fields=columns)
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return trusted_response(users, schemas.UserRead, headers=headers, exclude=exclude)
+    return trusted_response(crud.get_users(db, skip=skip, limit=limit, fields=columns), schemas.UserRead, exclude=exclude)
 
 @router.get("/me", response_model=schemas.UserRead)
 def get_current_user_info(
@@ -58,9 +70,11 @@ def get_current_user_info(
 @router.get("/{user_id}", response_model=schemas.UserRead)
 def get_user(
     user_id: int,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(dependencies.get_current_user)
 ):
+    """`fields=id,name` or `fields=summary` returns only those columns."""
     # Users can see their own profile, admins can see any profile
     if current_user.id != user_id and not current_user.is_admin:
         raise HTTPException(
@@ -68,9 +82,12 @@ def get_user(
             detail="Not enough permissions"
         )
     
-    user = crud.get_user(db, user_id)
+    columns = fieldsets.USERS.parse(fields)
+    user = crud.get_user(db, user_id, fields=columns)
     if not user:
         raise HTTPException(404, "User not found")
+    if columns:
+        return Response(dump_trusted_one(user, schemas.UserRead, fieldsets.USERS.exclude(columns)), media_type="application/json")
     return user
 
 @router.put("/{user_id}", response_model=schemas.UserRead)
@@ -136,6 +153,5 @@ def delete_user(
     if not user:
         raise HTTPException(404, "User not found")
 
-    db.delete(user)
-    db.commit()
+    crud.delete_user(db, user)
     return {"message": "User deleted successfully"}
@@ -0,0 +1,140 @@
+# routers/users_async.py
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import schemas, dependencies, crud_async, fieldsets, models
+from app.db import get_async_db
+from app.serialization import dump_trusted_one, trusted_response
+
+router = APIRouter(tags=["users"])
+
+def _require_self_or_admin(current_user: models.User, user_id: int):
+    # Users can access their own profile, admins can access any profile
+    if current_user.id != user_id and not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+
+@router.post("/", response_model=schemas.UserRead, status_code=status.HTTP_201_CREATED)
+async def create_user(
+    user_in: schemas.UserCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(dependencies.get_current_user_async)
+):
+    """
+    Create user. Email must be unique.
+    """
+    # Only admins can create users via this endpoint
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+
+    if await crud_async.get_user_by_email(db, user_in.email):
+        raise HTTPException(400, "Email already registered")
+
+    return await crud_async.create_user_with_password(db, user_in)
+
+@router.get("/", response_model=List[schemas.UserRead])
+async def get_users(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(dependencies.get_current_user_async)
+):
+    """
+    Get list of users (pagination via skip/limit, or via `cursor` - pass an
+    empty cursor for the first page and follow the `X-Next-Cursor` header).
+    `fields=id,name` or `fields=summary` returns only those columns.
+    """
+    # Only admins can list all users
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    columns = fieldsets.USERS.parse(fields)
+    exclude = fieldsets.USERS.exclude(columns)
+    if cursor is not None:
+        users, next_cursor = await crud_async.get_users_page(db, cursor=cursor, limit=limit, fields=columns)
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return trusted_response(users, schemas.UserRead, headers=headers, exclude=exclude)
+    users = await crud_async.get_users(db, skip=skip, limit=limit, fields=columns)
+    return trusted_response(users, schemas.UserRead, exclude=exclude)
+
+@router.get("/me", response_model=schemas.UserRead)
+async def get_current_user_info(
+    current_user: models.User = Depends(dependencies.get_current_user_async)
+):
+    """Get current user information"""
+    return current_user
+
+@router.get("/{user_id}", response_model=schemas.UserRead)
+async def get_user(
+    user_id: int,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(dependencies.get_current_user_async)
+):
+    """`fields=id,name` or `fields=summary` returns only those columns."""
+    _require_self_or_admin(current_user, user_id)
+
+    columns = fieldsets.USERS.parse(fields)
+    user = await crud_async.get_user(db, user_id, fields=columns)
+    if not user:
+        raise HTTPException(404, "User not found")
+    if columns:
+        return Response(dump_trusted_one(user, schemas.UserRead, fieldsets.USERS.exclude(columns)), media_type="application/json")
+    return user
+
+@router.put("/{user_id}", response_model=schemas.UserRead)
+async def update_user(
+    user_id: int,
+    user_update: schemas.UserUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(dependencies.get_current_user_async)
+):
+    """
+    Update user. Partial update supported.
+    """
+    _require_self_or_admin(current_user, user_id)
+
+    user = await crud_async.get_user(db, user_id)
+    if not user:
+        raise HTTPException(404, "User not found")
+
+    # Only admins can change verification status
+    if user_update.is_verified_author is not None and not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can change verification status"
+        )
+
+    # Check email uniqueness (if email is being changed)
+    if user_update.email and user_update.email != user.email:
+        if await crud_async.get_user_by_email(db, user_update.email):
+            raise HTTPException(400, "Email already registered")
+
+    return await crud_async.update_user(db, user, user_update)
+
+@router.delete("/{user_id}")
+async def delete_user(
+    user_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.User = Depends(dependencies.get_current_user_async)
+):
+    """
+    Delete user. Related records (news, comments) will be cascade deleted.
+    """
+    _require_self_or_admin(current_user, user_id)
+
+    user = await crud_async.get_user(db, user_id)
+    if not user:
+        raise HTTPException(404, "User not found")
+
+    await crud_async.delete_user(db, user)
+    return {"message": "User deleted successfully"}
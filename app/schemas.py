@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional, List, Any
-from pydantic import BaseModel, EmailStr, ConfigDict
+from pydantic import BaseModel, EmailStr, ConfigDict, ValidationError
 
 class Token(BaseModel):
     access_token: str
@@ -34,6 +34,8 @@ class UserRead(BaseModel):
     is_verified_author: bool
     is_admin: bool
     avatar: Optional[str]
+    news_count: int = 0
+    comment_count: int = 0
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -55,6 +57,7 @@ class NewsRead(BaseModel):
     published_at: datetime
     author_id: int
     cover: Optional[str]
+    comment_count: int = 0
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -71,8 +74,39 @@ class CommentRead(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class AuthorRead(BaseModel):
+    id: int
+    name: str
+    avatar: Optional[str]
+    is_verified_author: bool
+
+    model_config = ConfigDict(from_attributes=True)
+
+class NewsExpanded(NewsRead):
+    """NewsRead with the relations requested by `?include=` (see app.includes)."""
+    author: Optional[AuthorRead] = None
+    comments: Optional[List[CommentRead]] = None
+
 class SessionInfo(BaseModel):
     id: int
     user_agent: str
     created_at: datetime
     expires_at: datetime
+
+class BatchItemError(BaseModel):
+    index: int
+    detail: Any
+
+class BatchCreateResult(BaseModel):
+    created_ids: List[int]
+    errors: List[BatchItemError] = []
+
+def validate_batch(model, items: List[Any]):
+    """Validate batch items one by one, splitting them into valid models and per-item errors."""
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, model.model_validate(item)))
+        except ValidationError as e:
+            errors.append(BatchItemError(index=index, detail=e.errors(include_url=False)))
+    return valid, errors
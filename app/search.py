@@ -0,0 +1,143 @@
+"""
+Full-text search over news titles and the text of their JSON content blocks.
+
+PostgreSQL keeps a `news_search` table with a weighted tsvector per news and
+a GIN index on it; SQLite uses an FTS5 virtual table `news_fts` whose rowid
+is the news id. crud keeps the index in sync on every news write.
+"""
+import json
+from typing import Any, Iterable, List, Tuple
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from . import models
+from .config import settings
+from .pagination import clamp_limit
+
+_DDL = {
+    "postgresql": [
+        "CREATE TABLE IF NOT EXISTS news_search ("
+        " news_id INTEGER PRIMARY KEY REFERENCES news(id) ON DELETE CASCADE,"
+        " document TSVECTOR NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS ix_news_search_document ON news_search USING GIN (document)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5("
+        "title, body, tokenize = 'unicode61 remove_diacritics 2')",
+    ],
+}
+
+def extract_text(content: Any) -> str:
+    """Collect the text of all blocks of a news content document."""
+    if isinstance(content, str):
+        try:
+            content = json.loads(content)
+        except ValueError:
+            return content
+    parts: List[str] = []
+
+    def walk(node):
+        if isinstance(node, dict):
+            value = node.get("text")
+            if isinstance(value, str):
+                parts.append(value)
+            for key, child in node.items():
+                if key != "text":
+                    walk(child)
+        elif isinstance(node, list):
+            for child in node:
+                walk(child)
+
+    walk(content)
+    return "\n".join(parts)
+
+def _dialect(db: Session) -> str:
+    return db.get_bind().dialect.name
+
+def ensure_search_index(bind):
+    """Create the search table/index if missing (alembic does the same in 0006)."""
+    statements = _DDL.get(bind.dialect.name, [])
+    if not statements:
+        return
+    with bind.begin() as conn:
+        for statement in statements:
+            conn.execute(text(statement))
+
+def index_news_many(db: Session, rows: Iterable[Tuple[int, str, Any]]):
+    """Add or replace (news_id, title, content) rows in the index."""
+    params = [{"id": news_id, "title": title, "body": extract_text(content)} for news_id, title, content in rows]
+    if not params:
+        return
+    dialect = _dialect(db)
+    if dialect == "postgresql":
+        db.execute(text(
+            "INSERT INTO news_search (news_id, document) VALUES (:id, "
+            "setweight(to_tsvector(CAST(:config AS regconfig), :title), 'A') || "
+            "setweight(to_tsvector(CAST(:config AS regconfig), :body), 'B')) "
+            "ON CONFLICT (news_id) DO UPDATE SET document = EXCLUDED.document"
+        ), [dict(p, config=settings.SEARCH_TS_CONFIG) for p in params])
+    elif dialect == "sqlite":
+        db.execute(text("DELETE FROM news_fts WHERE rowid = :id"), [{"id": p["id"]} for p in params])
+        db.execute(text("INSERT INTO news_fts (rowid, title, body) VALUES (:id, :title, :body)"), params)
+
+def index_news(db: Session, news: models.News):
+    index_news_many(db, [(news.id, news.title, news.content)])
+
+def remove_news(db: Session, news_id: int):
+    # On PostgreSQL the row goes away with the news through ON DELETE CASCADE
+    if _dialect(db) == "sqlite":
+        db.execute(text("DELETE FROM news_fts WHERE rowid = :id"), {"id": news_id})
+
+def remove_news_by_author(db: Session, author_id: int):
+    if _dialect(db) == "sqlite":
+        db.execute(
+            text("DELETE FROM news_fts WHERE rowid IN (SELECT id FROM news WHERE author_id = :author_id)"),
+            {"author_id": author_id},
+        )
+
+def _fts5_query(q: str) -> str:
+    # Quote every term so user input cannot inject FTS5 syntax; terms are ANDed
+    return " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+
+def search_news(db: Session, q: str, skip: int = 0, limit: int = 20) -> List[models.News]:
+    """Return news matching `q`, best match first."""
+    limit = clamp_limit(limit)
+    dialect = _dialect(db)
+    if dialect == "postgresql":
+        ids = db.execute(text(
+            "SELECT news_id FROM news_search, websearch_to_tsquery(CAST(:config AS regconfig), :q) AS query "
+            "WHERE document @@ query "
+            "ORDER BY ts_rank_cd(document, query) DESC, news_id DESC "
+            "LIMIT :limit OFFSET :skip"
+        ), {"config": settings.SEARCH_TS_CONFIG, "q": q, "limit": limit, "skip": skip}).scalars().all()
+    elif dialect == "sqlite":
+        match = _fts5_query(q)
+        if not match:
+            return []
+        ids = db.execute(text(
+            "SELECT rowid FROM news_fts WHERE news_fts MATCH :q ORDER BY rank LIMIT :limit OFFSET :skip"
+        ), {"q": match, "limit": limit, "skip": skip}).scalars().all()
+    else:
+        raise HTTPException(status_code=501, detail=f"Search is not supported on {dialect}")
+
+    if not ids:
+        return []
+    by_id = {news.id: news for news in db.query(models.News).filter(models.News.id.in_(ids))}
+    return [by_id[news_id] for news_id in ids if news_id in by_id]
+
+def rebuild_search_index(db: Session, batch_size: int = 1000, min_id: int = 0) -> int:
+    """(Re)index every news with id > min_id in batches. Returns the number indexed."""
+    indexed = 0
+    last_id = min_id
+    while True:
+        rows = db.query(models.News.id, models.News.title, models.News.content)\
+            .filter(models.News.id > last_id)\
+            .order_by(models.News.id)\
+            .limit(batch_size)\
+            .all()
+        if not rows:
+            return indexed
+        index_news_many(db, rows)
+        db.commit()
+        indexed += len(rows)
+        last_id = rows[-1][0]
@@ -0,0 +1,337 @@
+"""
+Deterministic synthetic data for capacity tests, benchmarks and query-plan
+checks:
+
+    python -m app.seed --users 10000 --news 100000 --comments 1000000
+    python -m app.seed --news 1000000 --comments 10000000 --seed 7 --no-search-index
+
+Every value derives from --seed, so two runs against empty databases produce
+identical rows (only refresh token expiry is relative to the current time, to
+keep a share of sessions alive). Authorship and comments are heavy-tailed: a
+few authors write most news and a few news collect most comments (Pareto
+weights, --skew). News content is a JSON block document with headers,
+paragraphs, lists, quotes and images built from a Zipf-weighted vocabulary,
+so full-text search sees realistic term frequencies.
+
+Rows get explicit ids after the current maximum, counters are computed up
+front, and chunks are loaded with COPY on PostgreSQL (psycopg2) or one
+executemany INSERT elsewhere. Sequences are moved past the new ids at the end.
+All users share one password (--password) so any of them can log in.
+"""
+import argparse
+import csv
+import hashlib
+import io
+import json
+import random
+import time
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Dict, Iterator, List
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+from . import auth, models, search
+from .db import SessionLocal
+
+WORDS = (
+    "the of and to in is for on that with as news city new year people report said government "
+    "data market school team game music film health water energy road police court price week "
+    "local world project public service company study season support plan council street park "
+    "research result share open region centre build close policy change growth local museum "
+    "weather festival station bridge market station budget election vote hospital science space "
+    "river forest climate library transport airport concert player coach match league record "
+    "museum theatre artist book history village harbour island mountain winter summer spring "
+    "autumn morning evening night traffic train ticket student teacher doctor nurse engineer "
+    "software network security update release version feature startup investor launch product"
+).split()
+# Zipf weights: the n-th most common word appears ~1/n as often as the first
+WORD_WEIGHTS = list(accumulate(1 / rank for rank in range(1, len(WORDS) + 1)))
+
+USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_1) AppleWebKit/605.1.15 Version/17.1 Safari/605.1.15",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_1 like Mac OS X) AppleWebKit/605.1.15 Mobile/15E148",
+    "Mozilla/5.0 (X11; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0",
+    "okhttp/4.12.0",
+)
+
+@dataclass
+class SeedConfig:
+    users: int = 1000
+    news: int = 10000
+    comments: int = 100000
+    # Share of users allowed to publish
+    author_share: float = 0.1
+    # Average refresh tokens per user; about half of them already expired
+    tokens_per_user: float = 1.0
+    # Pareto shape of authorship/comment weights; smaller is more skewed
+    skew: float = 1.2
+    seed: int = 42
+    chunk_size: int = 10000
+    start: datetime = datetime(2023, 1, 1)
+    span: timedelta = timedelta(days=730)
+    password: str = "password"
+    search_index: bool = True
+
+@dataclass
+class SeedReport:
+    rows: Dict[str, int] = field(default_factory=dict)
+    started: float = field(default_factory=time.perf_counter)
+
+    def summary(self) -> str:
+        elapsed = time.perf_counter() - self.started
+        total = sum(self.rows.values())
+        counts = ", ".join(f"{table} {count}" for table, count in self.rows.items())
+        return f"{counts} in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.0f} rows/s)"
+
+def _rng(config: SeedConfig, stream: str) -> random.Random:
+    # Independent stream per table: changing one volume does not reshuffle the others
+    return random.Random(f"{config.seed}:{stream}")
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choices(WORDS, cum_weights=WORD_WEIGHTS, k=count))
+
+def _sentence(rng: random.Random, low: int, high: int) -> str:
+    sentence = _words(rng, rng.randint(low, high))
+    return sentence[0].upper() + sentence[1:] + "."
+
+def news_content(rng: random.Random, news_id: int) -> dict:
+    blocks = [{"type": "header", "level": 2, "text": _sentence(rng, 3, 8)}]
+    for _ in range(1 + min(int(rng.expovariate(0.5)), 12)):
+        kind = rng.random()
+        if kind < 0.7:
+            blocks.append({"type": "paragraph", "text": " ".join(_sentence(rng, 6, 20) for _ in range(rng.randint(1, 5)))})
+        elif kind < 0.8:
+            blocks.append({"type": "list", "style": "unordered",
+                           "items": [{"text": _sentence(rng, 2, 8)} for _ in range(rng.randint(2, 6))]})
+        elif kind < 0.9:
+            blocks.append({"type": "quote", "text": _sentence(rng, 5, 15), "caption": _words(rng, 2).title()})
+        else:
+            blocks.append({"type": "image", "url": f"https://picsum.photos/seed/{news_id}-{len(blocks)}/800/450",
+                           "caption": _sentence(rng, 2, 6)})
+    return {"blocks": blocks}
+
+def _pareto_cum_weights(rng: random.Random, count: int, skew: float) -> array:
+    return array("d", accumulate(rng.paretovariate(skew) for _ in range(count)))
+
+def _weighted_picks(rng: random.Random, cum_weights: array, count: int, chunk_size: int) -> array:
+    """`count` indexes into the weights, drawn chunk by chunk to bound peak memory."""
+    picks = array("i")
+    population = range(len(cum_weights))
+    for lo in range(0, count, chunk_size):
+        picks.extend(rng.choices(population, cum_weights=cum_weights, k=min(chunk_size, count - lo)))
+    return picks
+
+class Seeder:
+    def __init__(self, db: Session, config: SeedConfig):
+        self.db = db
+        self.config = config
+        self.dialect = db.get_bind().dialect
+        self.use_copy = self.dialect.driver == "psycopg2"
+
+    def _next_id(self, model) -> int:
+        return (self.db.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+    def _load(self, model, rows: List[dict]):
+        if not rows:
+            return
+        if self.use_copy:
+            columns = list(rows[0])
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows:
+                writer.writerow([
+                    json.dumps(row[c]) if c == "content" else ("" if row[c] is None else row[c])
+                    for c in columns
+                ])
+            buffer.seek(0)
+            # Empty unquoted CSV fields are NULL in COPY
+            cursor = self.db.connection().connection.cursor()
+            cursor.copy_expert(
+                f"COPY {model.__tablename__} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer
+            )
+        else:
+            self.db.connection().execute(model.__table__.insert(), rows)
+
+    def _load_chunks(self, model, rows: Iterator[dict], report: SeedReport):
+        chunk: List[dict] = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.config.chunk_size:
+                self._load(model, chunk)
+                self.db.commit()
+                report.rows[model.__tablename__] = report.rows.get(model.__tablename__, 0) + len(chunk)
+                chunk = []
+        self._load(model, chunk)
+        self.db.commit()
+        report.rows[model.__tablename__] = report.rows.get(model.__tablename__, 0) + len(chunk)
+
+    def _reset_sequences(self):
+        if self.dialect.name != "postgresql":
+            return
+        for model in (models.User, models.News, models.Comment, models.RefreshToken):
+            table = model.__tablename__
+            self.db.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"(SELECT coalesce(max(id), 1) FROM {table}))"
+            ))
+        self.db.commit()
+
+    def run(self, report: SeedReport) -> SeedReport:
+        config = self.config
+        user_base = self._next_id(models.User)
+        news_base = self._next_id(models.News)
+        comment_base = self._next_id(models.Comment)
+        authors = max(1, min(config.users, int(config.users * config.author_share)))
+
+        # Who wrote what and which news get the comments, decided up front so
+        # every counter can be written together with its row
+        news_author = _weighted_picks(
+            _rng(config, "news-authors"),
+            _pareto_cum_weights(_rng(config, "author-weights"), authors, config.skew),
+            config.news, config.chunk_size,
+        ) if config.news else array("i")
+        comment_news = _weighted_picks(
+            _rng(config, "comment-news"),
+            _pareto_cum_weights(_rng(config, "news-weights"), config.news, config.skew),
+            config.comments, config.chunk_size,
+        ) if config.news else array("i")
+        comment_author = _weighted_picks(
+            _rng(config, "comment-authors"),
+            _pareto_cum_weights(_rng(config, "commenter-weights"), config.users, config.skew),
+            len(comment_news), config.chunk_size,
+        ) if config.users else array("i")
+
+        news_count = array("i", bytes(4 * config.users))
+        user_comment_count = array("i", bytes(4 * config.users))
+        news_comment_count = array("i", bytes(4 * config.news))
+        for author in news_author:
+            news_count[author] += 1
+        for news, author in zip(comment_news, comment_author):
+            news_comment_count[news] += 1
+            user_comment_count[author] += 1
+
+        step = config.span / max(config.news, 1)
+
+        def news_published(index: int) -> datetime:
+            return config.start + step * index
+
+        password_hash = auth.pwd_context.hash(config.password)
+
+        def users():
+            rng = _rng(config, "users")
+            for index in range(config.users):
+                user_id = user_base + index
+                registered_at = config.start - timedelta(days=rng.uniform(0, 365))
+                yield {
+                    "id": user_id,
+                    "name": _words(rng, 2).title(),
+                    "email": f"seed{config.seed}-{user_id}@example.com",
+                    "password_hash": password_hash,
+                    "registered_at": registered_at,
+                    "is_verified_author": index < authors,
+                    "is_admin": False,
+                    "avatar": f"https://i.pravatar.cc/150?u={user_id}" if rng.random() < 0.6 else None,
+                    "github_id": None,
+                    "news_count": news_count[index],
+                    "comment_count": user_comment_count[index],
+                }
+
+        def news():
+            rng = _rng(config, "news")
+            for index in range(config.news):
+                news_id = news_base + index
+                published_at = news_published(index)
+                yield {
+                    "id": news_id,
+                    "title": _sentence(rng, 4, 12)[:300],
+                    "content": news_content(rng, news_id),
+                    "published_at": published_at,
+                    "updated_at": published_at,
+                    "author_id": user_base + news_author[index],
+                    "cover": f"https://picsum.photos/seed/{news_id}/1200/630" if rng.random() < 0.7 else None,
+                    "comment_count": news_comment_count[index],
+                }
+
+        def comments():
+            rng = _rng(config, "comments")
+            for index, (news_index, author_index) in enumerate(zip(comment_news, comment_author)):
+                # Most comments arrive within hours of publication
+                published_at = news_published(news_index) + timedelta(seconds=rng.expovariate(1 / 7200))
+                yield {
+                    "id": comment_base + index,
+                    "text": _sentence(rng, 2, 30),
+                    "news_id": news_base + news_index,
+                    "author_id": user_base + author_index,
+                    "published_at": published_at,
+                    "updated_at": published_at,
+                }
+
+        def tokens():
+            rng = _rng(config, "tokens")
+            now = datetime.utcnow()
+            token_id = self._next_id(models.RefreshToken)
+            for index in range(config.users):
+                sessions = int(rng.expovariate(1 / config.tokens_per_user) + 0.5) if config.tokens_per_user > 0 else 0
+                for _ in range(sessions):
+                    created_at = now - timedelta(days=rng.uniform(0, 14))
+                    yield {
+                        "id": token_id,
+                        "user_id": user_base + index,
+                        "token_hash": hashlib.sha256(f"{config.seed}:{token_id}".encode()).hexdigest(),
+                        "user_agent": rng.choice(USER_AGENTS),
+                        "created_at": created_at,
+                        "expires_at": created_at + timedelta(days=7),
+                    }
+                    token_id += 1
+
+        self._load_chunks(models.User, users(), report)
+        self._load_chunks(models.News, news(), report)
+        self._load_chunks(models.Comment, comments(), report)
+        self._load_chunks(models.RefreshToken, tokens(), report)
+        self._reset_sequences()
+        if config.search_index and config.news:
+            search.rebuild_search_index(self.db, batch_size=config.chunk_size, min_id=news_base - 1)
+        return report
+
+def seed_database(db: Session, config: SeedConfig) -> SeedReport:
+    return Seeder(db, config).run(SeedReport())
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate deterministic synthetic data")
+    parser.add_argument("--users", type=int, default=SeedConfig.users)
+    parser.add_argument("--news", type=int, default=SeedConfig.news)
+    parser.add_argument("--comments", type=int, default=SeedConfig.comments)
+    parser.add_argument("--author-share", type=float, default=SeedConfig.author_share)
+    parser.add_argument("--tokens-per-user", type=float, default=SeedConfig.tokens_per_user)
+    parser.add_argument("--skew", type=float, default=SeedConfig.skew,
+                        help="Pareto shape of authorship/comment weights, smaller is more skewed")
+    parser.add_argument("--seed", type=int, default=SeedConfig.seed)
+    parser.add_argument("--chunk-size", type=int, default=SeedConfig.chunk_size)
+    parser.add_argument("--password", default=SeedConfig.password, help="password of every generated user")
+    parser.add_argument("--no-search-index", action="store_true", help="skip building the full-text index")
+    args = parser.parse_args()
+
+    config = SeedConfig(
+        users=args.users,
+        news=args.news,
+        comments=args.comments,
+        author_share=args.author_share,
+        tokens_per_user=args.tokens_per_user,
+        skew=args.skew,
+        seed=args.seed,
+        chunk_size=args.chunk_size,
+        password=args.password,
+        search_index=not args.no_search_index,
+    )
+    db = SessionLocal()
+    try:
+        report = seed_database(db, config)
+    finally:
+        db.close()
+    print(report.summary())
+
+if __name__ == "__main__":
+    main()
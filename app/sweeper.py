@@ -0,0 +1,125 @@
+"""
+Background purge of expired refresh tokens.
+
+The lifespan in app.main starts a TokenSweeper that wakes up every
+TOKEN_SWEEP_INTERVAL seconds and deletes expired rows in batches of
+TOKEN_SWEEP_BATCH_SIZE, committing after each batch so no statement holds
+locks on many rows. The blocking work runs in a worker thread so the event
+loop keeps serving requests. A one-off purge is also available:
+
+    python -m app.sweeper --batch-size 5000
+"""
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from . import models
+from .config import settings
+from .db import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+def purge_expired_tokens(db: Session, batch_size: int = 1000, now: Optional[datetime] = None) -> int:
+    """Delete refresh tokens expired at `now` batch by batch. Returns the number deleted."""
+    now = now or datetime.utcnow()
+    batch = select(models.RefreshToken.id)\
+        .where(models.RefreshToken.expires_at <= now)\
+        .limit(batch_size)\
+        .scalar_subquery()
+    purged = 0
+    while True:
+        result = db.execute(
+            delete(models.RefreshToken)
+            .where(models.RefreshToken.id.in_(batch))
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        purged += result.rowcount
+        if result.rowcount < batch_size:
+            return purged
+
+class TokenSweeper:
+    def __init__(self, interval: float, batch_size: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.purged = 0
+        self.last_purged = 0
+        self.last_run: Optional[datetime] = None
+        self.last_duration = 0.0
+        self.last_error: Optional[str] = None
+
+    def sweep(self) -> int:
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            purged = purge_expired_tokens(db, self.batch_size)
+        finally:
+            db.close()
+        self.runs += 1
+        self.purged += purged
+        self.last_purged = purged
+        self.last_run = datetime.utcnow()
+        self.last_duration = time.perf_counter() - started
+        self.last_error = None
+        return purged
+
+    async def _run(self):
+        while True:
+            try:
+                purged = await asyncio.to_thread(self.sweep)
+                if purged:
+                    logger.info("purged %d expired refresh tokens in %.2fs", purged, self.last_duration)
+            except Exception as e:
+                # Keep sweeping on the next tick; the error is shown on /health
+                self.last_error = str(e)
+                logger.exception("refresh token sweep failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "interval": self.interval,
+            "batch_size": self.batch_size,
+            "runs": self.runs,
+            "purged": self.purged,
+            "last_purged": self.last_purged,
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "last_duration": self.last_duration,
+            "last_error": self.last_error,
+        }
+
+token_sweeper = TokenSweeper(settings.TOKEN_SWEEP_INTERVAL, settings.TOKEN_SWEEP_BATCH_SIZE)
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete expired refresh tokens")
+    parser.add_argument("--batch-size", type=int, default=settings.TOKEN_SWEEP_BATCH_SIZE)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        print(f"{purge_expired_tokens(db, args.batch_size)} expired refresh tokens deleted")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Throttling of /auth/login and /auth/register, checked before any Argon2 work.
+
+Every client IP and every email has a token bucket: `burst` attempts at
+once, refilled at `per_minute` attempts a minute. A request takes one token
+from both buckets or is answered 429 with `Retry-After`, without touching
+the database or the hashing pool.
+
+State is two floats per key in an LRU-ordered dict. A bucket that has been
+idle long enough to refill completely is the same as a new one, so such keys
+are dropped from the cold end on every call (amortised O(1)); `max_keys`
+caps memory under a flood of distinct keys.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+from fastapi import HTTPException, Request, status
+from . import auth, metrics
+from .config import settings
+
+class TokenBucketLimiter:
+    def __init__(self, per_minute: float, burst: int, max_keys: int = 100000):
+        self.rate = per_minute / 60.0
+        self.burst = float(max(1, burst))
+        self.max_keys = max_keys
+        # Seconds after which an untouched bucket is full again
+        self.idle_after = self.burst / self.rate if self.rate > 0 else math.inf
+        self._buckets: "OrderedDict[Hashable, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def acquire(self, key: Hashable) -> float:
+        """Take a token for `key`. Returns 0 when allowed, else seconds until the next token."""
+        if not self.enabled:
+            return 0.0
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            tokens, updated_at = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+            wait = 0.0
+            if tokens >= 1.0:
+                tokens -= 1.0
+            else:
+                wait = (1.0 - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+                self.evictions += 1
+            return wait
+
+    def _evict_idle(self, now: float):
+        while self._buckets:
+            key, (_, updated_at) = next(iter(self._buckets.items()))
+            if now - updated_at < self.idle_after:
+                break
+            del self._buckets[key]
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+class AuthThrottle:
+    """Per-IP and per-email limits for the password endpoints."""
+
+    def __init__(self):
+        self.by_ip = TokenBucketLimiter(
+            settings.AUTH_THROTTLE_IP_PER_MINUTE, settings.AUTH_THROTTLE_IP_BURST, settings.AUTH_THROTTLE_MAX_KEYS
+        )
+        self.by_email = TokenBucketLimiter(
+            settings.AUTH_THROTTLE_EMAIL_PER_MINUTE, settings.AUTH_THROTTLE_EMAIL_BURST, settings.AUTH_THROTTLE_MAX_KEYS
+        )
+        self.allowed = 0
+        self.rejected_ip = 0
+        self.rejected_email = 0
+        self._lock = threading.Lock()
+
+    def check(self, request: Request, email: Optional[str]):
+        """Raise 429 when the client IP or the email is over its limit."""
+        wait = self.by_ip.acquire(client_ip(request))
+        if wait:
+            with self._lock:
+                self.rejected_ip += 1
+            THROTTLED.labels("ip").inc()
+            raise _too_many(wait)
+        if email:
+            wait = self.by_email.acquire(email.strip().lower())
+            if wait:
+                with self._lock:
+                    self.rejected_email += 1
+                THROTTLED.labels("email").inc()
+                raise _too_many(wait)
+        with self._lock:
+            self.allowed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            allowed, rejected_ip, rejected_email = self.allowed, self.rejected_ip, self.rejected_email
+        # Every rejected request would have cost at most one Argon2 run
+        avoided = rejected_ip + rejected_email
+        return {
+            "allowed": allowed,
+            "rejected_ip": rejected_ip,
+            "rejected_email": rejected_email,
+            "hashes_avoided": avoided,
+            "hash_seconds_avoided": avoided * auth.mean_hash_seconds(),
+            "tracked_ips": len(self.by_ip),
+            "tracked_emails": len(self.by_email),
+            "evictions": self.by_ip.evictions + self.by_email.evictions,
+        }
+
+def client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+def _too_many(wait: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many authentication attempts, try again later",
+        headers={"Retry-After": str(math.ceil(wait))},
+    )
+
+THROTTLED = metrics.counter(
+    "auth_throttled_total", "Login/registration attempts rejected before password hashing", ["key"]
+)
+
+auth_throttle = AuthThrottle()
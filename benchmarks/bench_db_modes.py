@@ -0,0 +1,129 @@
+"""
+Requests-per-second comparison of the sync (SessionLocal) and async
+(AsyncSession, ASYNC_DB=true) database paths.
+
+Each mode runs the real app in a uvicorn subprocess against the same seeded
+database and is hammered with concurrent requests from an httpx client:
+
+    pip install -r benchmarks/requirements.txt
+    python benchmarks/bench_db_modes.py --database-url sqlite:///./bench.db \\
+        --requests 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EMAIL = "bench@example.com"
+PASSWORD = "bench-password"
+# The news router carries its own "/news" prefix on top of the one in app.main
+ENDPOINTS = ["/users/me", "/news/news/?limit=20"]
+
+def seed(database_url: str, news_count: int):
+    os.environ["DATABASE_URL"] = database_url
+    sys.path.insert(0, ROOT)
+    from sqlalchemy import create_engine, insert
+    from app import auth, models
+
+    engine = create_engine(database_url)
+    models.Base.metadata.drop_all(engine)
+    models.Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        user_id = conn.execute(insert(models.User).returning(models.User.id), {
+            "name": "Bench",
+            "email": EMAIL,
+            "password_hash": auth.pwd_context.hash(PASSWORD),
+            "is_verified_author": True,
+            "is_admin": False,
+        }).scalar_one()
+        conn.execute(insert(models.News), [
+            {
+                "title": f"News {i}",
+                "content": {"blocks": [{"type": "paragraph", "text": "Lorem ipsum " * 20}]},
+                "author_id": user_id,
+            }
+            for i in range(news_count)
+        ])
+    engine.dispose()
+
+def start_server(database_url: str, async_db: bool, port: int) -> subprocess.Popen:
+    env = dict(os.environ, DATABASE_URL=database_url, ASYNC_DB=str(async_db).lower())
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+async def run_load(base_url: str, path: str, requests: int, concurrency: int):
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        await wait_ready(client)
+        token = (await client.post("/auth/login", json={"email": EMAIL, "password": PASSWORD})).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+        errors = 0
+
+        async def one():
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(path, headers=headers)
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite:///./bench.db")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--news", type=int, default=500)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    seed(args.database_url, args.news)
+    print(f"{'mode':<6} {'endpoint':<24} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for mode, async_db in (("sync", False), ("async", True)):
+        server = start_server(args.database_url, async_db, args.port)
+        try:
+            for path in ENDPOINTS:
+                result = asyncio.run(run_load(f"http://127.0.0.1:{args.port}", path, args.requests, args.concurrency))
+                print(f"{mode:<6} {path:<24} {result['rps']:>9.1f} {result['p50_ms']:>9.2f} "
+                      f"{result['p99_ms']:>9.2f} {result['errors']:>7}")
+        finally:
+            server.terminate()
+            server.wait()
+
+if __name__ == "__main__":
+    main()
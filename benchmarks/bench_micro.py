@@ -0,0 +1,242 @@
+"""
+Micro-benchmarks of app.crud, app.dependencies and app.auth hot paths.
+
+Database cases run against SQLite files seeded by app.seed with N news, as
+many comments and N/100 users for every requested scale; the files are kept
+between runs and reseeded only when missing. Results are written as JSON and can be compared
+with a stored baseline; the exit code is 1 when any case got slower than
+the baseline by more than --threshold:
+
+    python benchmarks/bench_micro.py --scales 1000,100000 --save-baseline
+    # ... change code ...
+    python benchmarks/bench_micro.py --scales 1000,100000 --threshold 0.15
+    python benchmarks/bench_micro.py --scales 1000000 --only get_news
+
+The serialize_news_page_* cases encode one loaded page of 100 news: `stdlib`
+is what response_model + JSONResponse did per page (Pydantic validation,
+then json.dumps), `pydantic` is validation plus pydantic-core dump_json, and
+`trusted` is app.serialization (orjson, no validation).
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+DEFAULT_RESULTS = os.path.join(HERE, "results", "latest.json")
+
+def database_path(db_dir: str, scale: int) -> str:
+    return os.path.join(db_dir, f"bench_{scale}.db")
+
+def seed(engine, scale: int):
+    from sqlalchemy.orm import sessionmaker
+    from app import models
+    from app.seed import SeedConfig, seed_database
+
+    models.Base.metadata.drop_all(engine)
+    models.Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        seed_database(db, SeedConfig(users=max(10, scale // 100), news=scale, comments=scale, search_index=False))
+    finally:
+        db.close()
+
+def measure(fn, min_time: float, repeat: int) -> dict:
+    """Per-call seconds: calibrate a loop count taking >= min_time, then repeat it."""
+    fn()
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    runs = [elapsed / loops]
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        runs.append((time.perf_counter() - started) / loops)
+    return {
+        "median_us": statistics.median(runs) * 1e6,
+        "min_us": min(runs) * 1e6,
+        "loops": loops,
+        "repeat": repeat,
+    }
+
+def core_cases():
+    from app import auth, dependencies
+
+    token = dependencies.create_access_token({"user_id": 1})
+    password = "bench-password"
+    password_hash = asyncio.run(auth.get_password_hash(password))
+
+    def verify_cold():
+        dependencies.token_cache.clear()
+        dependencies.decode_access_token(token)
+
+    return {
+        "create_access_token": lambda: dependencies.create_access_token({"user_id": 1}),
+        "create_refresh_token": lambda: dependencies.create_refresh_token({"user_id": 1}),
+        "verify_token": lambda: dependencies.verify_token(token),
+        "decode_access_token_cold": verify_cold,
+        "decode_access_token_cached": lambda: dependencies.decode_access_token(token),
+        "get_password_hash": lambda: asyncio.run(auth.get_password_hash(password)),
+        "verify_password": lambda: asyncio.run(auth.verify_password(password, password_hash)),
+    }
+
+def serialization_cases(db):
+    from typing import List
+    from pydantic import TypeAdapter
+    from app import crud, schemas, serialization
+
+    page = crud.get_news(db, skip=0, limit=100)
+    adapter = TypeAdapter(List[schemas.NewsRead])
+
+    def stdlib():
+        content = adapter.dump_python(adapter.validate_python(page, from_attributes=True), mode="json")
+        json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+
+    return {
+        "serialize_news_page_stdlib": stdlib,
+        "serialize_news_page_pydantic": lambda: adapter.dump_json(adapter.validate_python(page, from_attributes=True)),
+        "serialize_news_page_trusted": lambda: serialization.dump_trusted(page, schemas.NewsRead),
+    }
+
+def db_cases(db, scale: int):
+    from sqlalchemy import select
+    from app import crud, dependencies, fieldsets, models
+
+    loop = asyncio.new_event_loop()
+    token = dependencies.create_access_token({"user_id": 1})
+    # Seeded comments are heavy-tailed; time the news that collected the most
+    hot_news_id = db.execute(
+        select(models.News.id).order_by(models.News.comment_count.desc()).limit(1)
+    ).scalar_one()
+    _, cursor = crud.get_news_page(db, cursor="", limit=100)
+
+    def current_user():
+        loop.run_until_complete(dependencies.get_current_user(db=db, token=token))
+        db.expunge_all()
+
+    def run(fn):
+        def case():
+            fn()
+            # Measure loading rows, not returning objects from the identity map
+            db.expunge_all()
+        return case
+
+    return {
+        "get_news": run(lambda: crud.get_news(db, skip=0, limit=100)),
+        "get_news_summary": run(lambda: crud.get_news(db, skip=0, limit=100, fields=fieldsets.NEWS.views["summary"])),
+        "get_news_deep_offset": run(lambda: crud.get_news(db, skip=scale // 2, limit=100)),
+        "get_news_page": run(lambda: crud.get_news_page(db, cursor=cursor, limit=100)),
+        "get_news_by_id": run(lambda: crud.get_news_by_id(db, scale // 2)),
+        "get_comments_by_news": run(lambda: crud.get_comments_by_news(db, hot_news_id, limit=100)),
+        "get_user_sessions": run(lambda: crud.get_user_sessions(db, 1)),
+        "get_current_user": current_user,
+    }
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    regressions = []
+    print(f"\n{'case':<48} {'baseline us':>12} {'current us':>12} {'change':>8}")
+    for key, current in sorted(results.items()):
+        before = baseline.get(key)
+        if before is None:
+            continue
+        change = current["median_us"] / before["median_us"] - 1
+        flag = " REGRESSION" if change > threshold else ""
+        print(f"{key:<48} {before['median_us']:>12.1f} {current['median_us']:>12.1f} {change:>+8.1%}{flag}")
+        if flag:
+            regressions.append(key)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="1000,100000",
+                        help="comma-separated news counts, e.g. 1000,100000,1000000")
+    parser.add_argument("--db-dir", default=HERE)
+    parser.add_argument("--reseed", action="store_true", help="rebuild the SQLite files")
+    parser.add_argument("--only", default=None, help="run cases whose name contains this string")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timed run")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--results", default=DEFAULT_RESULTS)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown of the median before failing (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    scales = [int(scale) for scale in args.scales.split(",") if scale]
+    # Settings are read at import time; keep the app off any real database
+    os.environ.setdefault("DATABASE_URL", "sqlite:///" + database_path(args.db_dir, scales[0]))
+    sys.path.insert(0, ROOT)
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app import auth
+
+    results = {}
+
+    def record(key: str, fn):
+        if args.only and args.only not in key:
+            return
+        results[key] = measure(fn, args.min_time, args.repeat)
+        print(f"{key:<48} {results[key]['median_us']:>12.1f} us")
+
+    try:
+        for name, fn in core_cases().items():
+            record(f"core/{name}", fn)
+
+        for scale in scales:
+            path = database_path(args.db_dir, scale)
+            engine = create_engine(f"sqlite:///{path}")
+            if args.reseed or not os.path.exists(path) or os.path.getsize(path) == 0:
+                started = time.perf_counter()
+                seed(engine, scale)
+                print(f"seeded {path} in {time.perf_counter() - started:.1f}s")
+            db = sessionmaker(bind=engine, autoflush=False)()
+            try:
+                for name, fn in db_cases(db, scale).items():
+                    record(f"scale={scale}/{name}", fn)
+                for name, fn in serialization_cases(db).items():
+                    record(f"scale={scale}/{name}", fn)
+            finally:
+                db.close()
+                engine.dispose()
+    finally:
+        auth.shutdown_hash_executor()
+
+    report = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scales": scales,
+        },
+        "results": results,
+    }
+    for target in [args.results] + ([args.baseline] if args.save_baseline else []):
+        os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+        with open(target, "w") as f:
+            json.dump(report, f, indent=2)
+    print(f"\nresults written to {args.results}")
+
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) slower than baseline by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Throughput of MongoDBRepository (pymongo, called from a thread pool the way a
+sync FastAPI route would be) against AsyncMongoDBRepository (motor, one event
+loop) at the same concurrency, on a scratch collection of a running mongod:
+
+    python benchmarks/bench_mongo_repos.py --mongodb-url mongodb://localhost:27017/ \\
+        --documents 5000 --operations 5000 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from pydantic import BaseModel
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class Doc(BaseModel):
+    title: str
+    content: dict
+    published_at: datetime
+
+class DocUpdate(BaseModel):
+    title: str
+
+def make_docs(count: int):
+    start = datetime(2024, 1, 1)
+    return [
+        Doc(title=f"News {i}", content={"blocks": [{"type": "paragraph", "text": "Lorem ipsum " * 40}]},
+            published_at=start + timedelta(seconds=i))
+        for i in range(count)
+    ]
+
+def workloads(documents: int, operations: int):
+    rng = random.Random(42)
+    ids = [rng.randint(1, documents) for _ in range(operations)]
+    pages = [rng.randint(0, max(documents - 20, 0)) for _ in range(operations)]
+    return {
+        "get": [("get", (doc_id,)) for doc_id in ids],
+        "get_multi(20)": [("get_multi", (skip, 20)) for skip in pages],
+        "get_multi(20, fields=title)": [("get_multi", (skip, 20, ["title"])) for skip in pages],
+        "update": [("update", (doc_id, DocUpdate(title=f"Updated {doc_id}"))) for doc_id in ids],
+    }
+
+def run_sync(repo, calls, concurrency: int) -> float:
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        started = time.perf_counter()
+        list(pool.map(lambda call: getattr(repo, call[0])(*call[1]), calls))
+        return len(calls) / (time.perf_counter() - started)
+
+async def run_async(repo, calls, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(call):
+        async with semaphore:
+            await getattr(repo, call[0])(*call[1])
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(call) for call in calls))
+    return len(calls) / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongodb-url", default="mongodb://localhost:27017/")
+    parser.add_argument("--database", default="bench_repositories")
+    parser.add_argument("--documents", type=int, default=5000)
+    parser.add_argument("--operations", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    os.environ["MONGODB_URL"] = args.mongodb_url
+    os.environ["MONGODB_DB"] = args.database
+    sys.path.insert(0, ROOT)
+    from app.repositories.mongodb_repo import MongoDBRepository, close_mongo_client, get_mongo_client
+    from app.repositories.mongodb_async_repo import AsyncMongoDBRepository, close_async_mongo_client
+
+    client = get_mongo_client()
+    client.drop_database(args.database)
+    repo = MongoDBRepository("news")
+    started = time.perf_counter()
+    repo.bulk_create(make_docs(args.documents))
+    print(f"seeded {args.documents} documents with bulk_create in {time.perf_counter() - started:.2f}s")
+
+    suite = workloads(args.documents, args.operations)
+
+    async def run_all_async():
+        async_repo = AsyncMongoDBRepository("news")
+        await async_repo.get(1)  # bootstrap indexes outside the timing
+        return {name: await run_async(async_repo, calls, args.concurrency) for name, calls in suite.items()}
+
+    try:
+        sync_results = {name: run_sync(repo, calls, args.concurrency) for name, calls in suite.items()}
+        async_results = asyncio.run(run_all_async())
+    finally:
+        client.drop_database(args.database)
+        close_async_mongo_client()
+        close_mongo_client()
+
+    print(f"\n{'operation':<30} {'sync ops/s':>12} {'async ops/s':>12} {'async/sync':>11}")
+    for name in suite:
+        ratio = async_results[name] / sync_results[name]
+        print(f"{name:<30} {sync_results[name]:>12.0f} {async_results[name]:>12.0f} {ratio:>10.2f}x")
+
+if __name__ == "__main__":
+    main()
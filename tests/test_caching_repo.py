@@ -0,0 +1,85 @@
+import mongomock
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app import models, schemas
+from app.cache import TTLCache
+from app.db import Base
+from app.repositories import mongodb_repo
+from app.repositories import caching_repo
+from app.repositories.caching_repo import CachingRepository
+from app.repositories.mongodb_repo import MongoDBRepository
+from app.repositories.sqlalchemy_repo import SQLAlchemyRepository
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    # Default expire_on_commit=True, as app.db.SessionLocal
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+def test_cached_sqlalchemy_objects_outlive_their_session(session_factory):
+    cache = TTLCache()
+    db = session_factory()
+    repo = CachingRepository(SQLAlchemyRepository(db, models.User), cache=cache, schema=schemas.UserRead)
+    created = repo.create(schemas.UserBase(name="a", email="a@example.com"))
+    assert repo.get(created.id).name == "a"
+    # Expires every instance the session loaded, then detaches them
+    db.commit()
+    db.close()
+
+    db = session_factory()
+    repo = CachingRepository(SQLAlchemyRepository(db, models.User), cache=cache, schema=schemas.UserRead)
+    cached = repo.get(created.id)
+    assert isinstance(cached, schemas.UserRead)
+    assert cached.email == "a@example.com"
+    assert cache.stats()["hits"] == 1
+
+    repo.update(created.id, schemas.UserUpdate(name="b"))
+    assert repo.get(created.id).name == "b"
+    db.close()
+
+def test_orm_objects_need_a_schema(session_factory):
+    db = session_factory()
+    db.add(models.User(name="a", email="a@example.com"))
+    db.commit()
+    repo = CachingRepository(SQLAlchemyRepository(db, models.User))
+    with pytest.raises(TypeError):
+        repo.get(1)
+    db.close()
+
+def test_plain_data_needs_no_schema():
+    mongodb_repo._indexed_collections.clear()
+    repo = CachingRepository(MongoDBRepository("news", client=mongomock.MongoClient()))
+    created = repo.create(schemas.NewsCreate(title="t", content={}))
+    assert repo.get(created["id"])["title"] == "t"
+    assert repo.get(created["id"])["title"] == "t"
+    assert repo.stats()["hits"] == 1
+    mongodb_repo._indexed_collections.clear()
+
+class RacingRepository:
+    """Returns the value read before a concurrent write invalidates it."""
+
+    def __init__(self, wrapper):
+        self.wrapper = wrapper
+
+    def get(self, id):
+        stale = {"id": id, "title": "old"}
+        self.wrapper.cache.pop(id)
+        return stale
+
+def test_value_read_before_an_invalidation_is_not_cached():
+    repo = CachingRepository(None, cache=TTLCache())
+    repo.repository = RacingRepository(repo)
+    assert repo.get(1)["title"] == "old"
+    assert 1 not in repo.cache
+    assert repo.cache.stats()["stale_sets"] == 1
+
+def test_shared_caches_are_reported(monkeypatch):
+    monkeypatch.setattr(caching_repo, "_shared_caches", {})
+    cache = caching_repo.shared_cache("users")
+    assert caching_repo.shared_cache("users") is cache
+    cache.set(1, {"id": 1})
+    cache.get(1)
+    assert caching_repo.repository_cache_stats()["users"]["hits"] == 1
@@ -0,0 +1,24 @@
+from app.importer import ImportReport, copy_statement, read_records
+
+def test_non_object_records_are_rejected(tmp_path):
+    path = tmp_path / "news.ndjson"
+    path.write_text('5\n"x"\n[1]\n{"title": "t"}\nnot json\n', encoding="utf-8")
+    records = list(read_records(str(path), "ndjson"))
+    assert [line for line, _ in records] == [1, 2, 3, 4, 5]
+    assert [r for _, r in records[:3]] == [{"_error": "record must be a JSON object"}] * 3
+    assert records[3][1] == {"title": "t"}
+    assert records[4][1]["_error"].startswith("invalid JSON")
+
+def test_rejected_sample_is_bounded():
+    report = ImportReport(max_rejected=3)
+    for line in range(10):
+        report.reject(line, "bad")
+    assert report.rejected_count == 10
+    assert report.rejected == [(0, "bad"), (1, "bad"), (2, "bad")]
+    assert "rejected 10" in report.summary()
+
+def test_copy_keeps_empty_required_fields_not_null():
+    statement = copy_statement("news", ["title", "content", "cover"], ("title", "content"))
+    assert statement == (
+        "COPY news (title, content, cover) FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL (title, content))"
+    )
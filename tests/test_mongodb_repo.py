@@ -0,0 +1,85 @@
+import mongomock
+import pymongo
+import pytest
+from pydantic import BaseModel
+from typing import Optional
+from app.config import settings
+from app.repositories import mongodb_repo
+from app.repositories.mongodb_repo import MongoDBRepository
+
+class NewsIn(BaseModel):
+    title: str
+    cover: Optional[str] = None
+
+class NewsUpdate(BaseModel):
+    title: Optional[str] = None
+    cover: Optional[str] = None
+
+@pytest.fixture
+def client():
+    mongodb_repo._indexed_collections.clear()
+    client = mongomock.MongoClient()
+    yield client
+    client.close()
+    mongodb_repo._indexed_collections.clear()
+
+@pytest.fixture
+def repo(client):
+    return MongoDBRepository("news", client=client)
+
+def test_ids_are_sequential(repo):
+    ids = [repo.create(NewsIn(title=f"n{i}"))["id"] for i in range(3)]
+    assert ids == [1, 2, 3]
+    assert [doc["id"] for doc in repo.bulk_create([NewsIn(title="a"), NewsIn(title="b")])] == [4, 5]
+    assert repo.create(NewsIn(title="c"))["id"] == 6
+
+def test_sequence_continues_after_existing_documents(client):
+    client[settings.MONGODB_DB]["news"].insert_many([{"id": 10, "title": "old"}, {"id": 7, "title": "older"}])
+    repo = MongoDBRepository("news", client=client)
+    assert repo.create(NewsIn(title="new"))["id"] == 11
+
+def test_legacy_documents_without_id_are_backfilled(client, monkeypatch):
+    monkeypatch.setattr(mongodb_repo, "BACKFILL_BATCH_SIZE", 2)
+    client[settings.MONGODB_DB]["news"].insert_many(
+        [{"title": "legacy1"}, {"id": 4, "title": "numbered"}, {"title": "legacy2"}, {"title": "legacy3"}]
+    )
+    repo = MongoDBRepository("news", client=client)
+    ids = {doc["title"]: doc["id"] for doc in repo.get_multi()}
+    assert ids == {"legacy1": 5, "numbered": 4, "legacy2": 6, "legacy3": 7}
+    assert repo.create(NewsIn(title="new"))["id"] == 8
+    with pytest.raises(pymongo.errors.DuplicateKeyError):
+        repo.collection.insert_one({"id": 8, "title": "duplicate"})
+
+def test_unique_id_index_rejects_duplicates(repo):
+    created = repo.create(NewsIn(title="first"))
+    with pytest.raises(pymongo.errors.DuplicateKeyError):
+        repo.collection.insert_one({"id": created["id"], "title": "duplicate"})
+
+def test_get_multi_projects_requested_fields(repo):
+    repo.bulk_create([NewsIn(title="a", cover="a.png"), NewsIn(title="b", cover="b.png")])
+    docs = repo.get_multi(fields=["title"])
+    assert docs == [{"id": 1, "title": "a"}, {"id": 2, "title": "b"}]
+    assert all("_id" not in doc for doc in repo.get_multi())
+
+def test_bulk_create_returns_documents_without_object_id(repo):
+    docs = repo.bulk_create([NewsIn(title="a"), NewsIn(title="b", cover="b.png")])
+    assert docs == [
+        {"title": "a", "cover": None, "id": 1},
+        {"title": "b", "cover": "b.png", "id": 2},
+    ]
+    assert repo.bulk_create([]) == []
+    assert repo.collection.count_documents({}) == 2
+
+def test_bulk_update_applies_partial_updates(repo):
+    repo.bulk_create([NewsIn(title="a", cover="a.png"), NewsIn(title="b"), NewsIn(title="c")])
+    count = repo.bulk_update([
+        (1, NewsUpdate(title="A")),
+        (2, NewsUpdate(cover="b.png")),
+        (3, NewsUpdate()),  # nothing set, no operation sent
+        (99, NewsUpdate(title="missing")),
+    ])
+    assert count == 2
+    assert repo.get(1) == {"id": 1, "title": "A", "cover": "a.png"}
+    assert repo.get(2) == {"id": 2, "title": "b", "cover": "b.png"}
+    assert repo.get(3) == {"id": 3, "title": "c", "cover": None}
+    assert repo.bulk_update([]) == 0